@@ -1 +1,15 @@
-__all__ = ["battery", "heat_transfer", "resistivity", "wearable", "wire"]
+__all__ = [
+    "batch",
+    "battery",
+    "bundle",
+    "cli",
+    "conductor",
+    "coulomb",
+    "distribution",
+    "heat_transfer",
+    "pack",
+    "resistivity",
+    "voltage_drop",
+    "wearable",
+    "wire",
+]
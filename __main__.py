@@ -0,0 +1,13 @@
+#
+# Copyright (c) 2023, Christopher Hoover
+#
+# SPDX-License-Identifier: BSD-3-Clause
+#
+
+"""Runs the command line interface: python -m engmath."""
+
+import sys
+
+from .cli import main
+
+sys.exit(main())
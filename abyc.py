@@ -6,19 +6,29 @@
 
 """ABCY E-11."""
 
-import pandas as pd
+import dataclasses
+import functools
+
+import numpy as np
 import quantities as pq
 
-from . import abyc_data, wire
+from . import abyc_data, conductor, resistivity, wire
 
 
 #
 # TABLE VI – B - AC & DC CIRCUITS – ALLOWABLE AMPERAGE OF CONDUCTORS WHEN UP TO
 # THREE CURRENT CARRYING CONDUCTORS ARE BUNDLED, SHEATHED OR IN CONDUIT
-def GetWireGaugeUpToThreeConductorBundle(
-    current, insulation_temp_rating, engine_room=False
-):
-    mag_current_A = int(current.rescale("A").magnitude)
+def _Result(awg, metric):
+    """The AWG answer, or with metric the smallest metric size at least as
+    large.
+
+    """
+    if metric:
+        return conductor.NextLargerMetricSize(awg)
+    return wire.CanonicalizeAWG(awg)
+
+
+def _TableVIBColumn(insulation_temp_rating, engine_room):
     mag_insulation_temp_rating_C = int(insulation_temp_rating.rescale("C").magnitude)
     if mag_insulation_temp_rating_C not in abyc_data.TABLE_VI_B_KNOWN_TEMPS_C:
         raise KeyError(
@@ -26,11 +36,43 @@ def GetWireGaugeUpToThreeConductorBundle(
         )
     engine_room_suffix = "_engroom" if engine_room else ""
     column_name = f"current_{mag_insulation_temp_rating_C}C{engine_room_suffix}"
-    awg_vs_current = abyc_data.TABLE_VI_B[column_name]
-    acceptable_awgs = awg_vs_current[awg_vs_current >= mag_current_A]
-    if acceptable_awgs.empty:
+    return abyc_data.TABLE_VI_B[column_name]
+
+
+def GetWireGaugeUpToThreeConductorBundle(
+    current, insulation_temp_rating, engine_room=False, metric=False
+):
+    mag_current_A = int(current.rescale("A").magnitude)
+    current_vs_awg = _TableVIBColumn(insulation_temp_rating, engine_room)
+    acceptable_rows = np.flatnonzero(current_vs_awg >= mag_current_A)
+    if acceptable_rows.size == 0:
         raise ValueError("No acceptable wire guage for circuit.")
-    return wire.CanonicalizeAWG(acceptable_awgs.keys()[0])
+    return _Result(str(abyc_data.TABLE_VI_B.index[acceptable_rows[0]]), metric)
+
+
+def TableVIBAWGNumbers():
+    """The Table VI-B gauges as AWG numbers, smallest wire first."""
+    return conductor.AWGNumbers(abyc_data.TABLE_VI_B.index)
+
+
+def GetAWGNumbersUpToThreeConductorBundle(
+    current, insulation_temp_rating, engine_room=False
+):
+    """Vectorized GetWireGaugeUpToThreeConductorBundle() giving AWG numbers.
+
+    engine_room may be an array matching current.
+
+    """
+    mag_current_A = np.trunc(np.asarray(current.rescale(pq.A).magnitude, dtype=float))
+    # The allowable currents increase down each column.
+    rows = np.where(
+        engine_room,
+        np.searchsorted(_TableVIBColumn(insulation_temp_rating, True), mag_current_A),
+        np.searchsorted(_TableVIBColumn(insulation_temp_rating, False), mag_current_A),
+    )
+    if np.any(rows >= len(abyc_data.TABLE_VI_B.index)):
+        raise ValueError("No acceptable wire guage for circuit.")
+    return TableVIBAWGNumbers()[rows]
 
 
 #
@@ -60,25 +102,31 @@ def _list_max(values, minvalue):
     raise ValueError("No max value")
 
 
-def GetWireGaugeForDCDrop(voltage, current, full_circuit_length, drop_pc=3):
-    mag_current_A = int(current.rescale(pq.A).magnitude)
-    mag_voltage_V = int(voltage.rescale(pq.V).magnitude)
+def _CheckTableIXXKey(mag_voltage_V, drop_pc):
     if mag_voltage_V not in _TABLE_IX_X_VOLTAGES:
-        raise ValueError("Voltage is not {_TABLE_IX_X_VOLTAGES} V")
+        raise ValueError(f"Voltage is not one of {_TABLE_IX_X_VOLTAGES} V")
     if drop_pc not in _TABLE_IX_X_DROP_PCS:
-        raise ValueError("Drop percentage not {_TABLE_IX_X_DROP_PCS}")
+        raise ValueError(f"Drop percentage not one of {_TABLE_IX_X_DROP_PCS}")
+
+
+def GetWireGaugeForDCDrop(
+    voltage, current, full_circuit_length, drop_pc=3, metric=False
+):
+    mag_current_A = int(current.rescale(pq.A).magnitude)
+    mag_voltage_V = int(voltage.rescale(pq.V).magnitude)
+    _CheckTableIXXKey(mag_voltage_V, drop_pc)
     key = (mag_voltage_V, drop_pc)
     table = _TABLE_IX_X[key]
     length_ft = _list_max(
         _TABLE_IX_X_KNOWN_LENGTHS_FT, full_circuit_length.rescale(pq.ft).magnitude
     )
     column_name = f"awg_{length_ft}ft"
-    current_vs_awg = table[column_name]
-    awg_vs_current = pd.Series(current_vs_awg.index, current_vs_awg.values)
-    acceptable_awgs = awg_vs_current[awg_vs_current >= mag_current_A]
-    if acceptable_awgs.empty:
+    awg_vs_current = table[column_name]
+    acceptable_rows = np.flatnonzero(table.index >= mag_current_A)
+    # An empty cell means that no listed gauge suffices.
+    if acceptable_rows.size == 0 or not awg_vs_current[acceptable_rows[0]]:
         raise ValueError("No acceptable wire guage for full circuit.")
-    return wire.CanonicalizeAWG(acceptable_awgs.keys()[0])
+    return _Result(str(awg_vs_current[acceptable_rows[0]]), metric)
 
 
 def GetWireGaugeForDCCircuit(
@@ -88,11 +136,213 @@ def GetWireGaugeForDCCircuit(
     insulation_temp_rating,
     drop_pc=3,
     engine_room=False,
+    metric=False,
+    material="copper",
 ):
+    if resistivity.GetMaterial(material) is not resistivity.Copper:
+        # Tables IX and X are for copper.
+        (awg,) = GetCircuitMargins(
+            voltage,
+            current,
+            full_circuit_length,
+            insulation_temp_rating,
+            drop_pc=drop_pc,
+            engine_room=engine_room,
+            material=material,
+        ).awg
+        if np.isnan(awg):
+            raise ValueError("No acceptable wire guage for circuit.")
+        return _Result(int(awg), metric)
     awg_for_drop = GetWireGaugeForDCDrop(
         voltage, current, full_circuit_length, drop_pc=drop_pc
     )
     awg_for_bundle = GetWireGaugeUpToThreeConductorBundle(
         current, insulation_temp_rating, engine_room=engine_room
     )
-    return min(awg_for_drop, awg_for_bundle)
+    # The larger wire has the smaller AWG number.
+    awg = min(
+        wire.AWGSpecificationToNumber(awg_for_drop),
+        wire.AWGSpecificationToNumber(awg_for_bundle),
+    )
+    return _Result(awg, metric)
+
+
+#
+# Margins of many circuits at once.
+
+
+@dataclasses.dataclass(frozen=True)
+class CircuitMargins:
+    """Per circuit results of GetCircuitMargins(), as columns.
+
+    AWG numbers are floats, NaN where no listed gauge meets the constraint.
+    binding names the constraint that sets awg: "drop", "ampacity" or
+    "both" when they require the same gauge or neither can be met.  The
+    drop is that of conductors of the chosen gauge by the resistance model.
+
+    """
+
+    awg: np.ndarray
+    awg_for_drop: np.ndarray
+    awg_for_ampacity: np.ndarray
+    binding: np.ndarray
+    allowable_current: pq.Quantity
+    ampacity_headroom: pq.Quantity
+    drop_pc: np.ndarray
+    drop_headroom_pc: np.ndarray
+
+    def to_frame(self):
+        """Returns the margins as a pandas DataFrame (requires pandas)."""
+        import pandas as pd  # pylint: disable=import-outside-toplevel
+
+        return pd.DataFrame(
+            {
+                field.name: np.asarray(getattr(self, field.name))
+                for field in dataclasses.fields(self)
+            }
+        )
+
+
+@functools.cache
+def _TableIXXAWGNumbers(key):
+    """Table IX or X as AWG numbers by current and length."""
+    table = _TABLE_IX_X[key]
+    cells = np.stack(
+        [table[f"awg_{length_ft}ft"] for length_ft in _TABLE_IX_X_KNOWN_LENGTHS_FT],
+        axis=1,
+    )
+    numbers = np.full(cells.shape, np.nan)
+    listed = cells != ""
+    numbers[listed] = conductor.AWGNumbers(cells[listed])
+    return numbers
+
+
+def _AWGNumbersForDCDrop(mag_voltage_V, mag_current_A, length_ft, drop_pc):
+    awg = np.full(mag_current_A.shape, np.nan)
+    for voltage_V, pc in set(zip(mag_voltage_V.tolist(), drop_pc.tolist())):
+        numbers = _TableIXXAWGNumbers((voltage_V, pc))
+        selected = (mag_voltage_V == voltage_V) & (drop_pc == pc)
+        rows = np.searchsorted(_TABLE_IX_X[(voltage_V, pc)].index, mag_current_A)
+        columns = np.searchsorted(_TABLE_IX_X_KNOWN_LENGTHS_FT, length_ft)
+        listed = selected & (rows < numbers.shape[0]) & (columns < numbers.shape[1])
+        awg[listed] = numbers[rows[listed], columns[listed]]
+    return awg
+
+
+def _AWGNumbersOfEqualResistance(copper_awg, material):
+    """The smallest Table VI-B gauges of the material with no more
+    resistance than the copper gauges, NaN where none has.
+
+    """
+    sizes = TableVIBAWGNumbers()
+    area_mm2 = conductor.AWGArea(sizes).magnitude
+    ratio = float((material.resistivity / resistivity.p_Cu).simplified)
+    found = ~np.isnan(copper_awg)
+    needed_mm2 = ratio * conductor.AWGArea(copper_awg[found].astype(int)).magnitude
+    indices = np.searchsorted(area_mm2, needed_mm2 * (1.0 - 1e-12))
+    fits = indices < len(sizes)
+    awg = np.full(copper_awg.shape, np.nan)
+    awg[np.flatnonzero(found)[fits]] = sizes[indices[fits]]
+    return awg
+
+
+def _AllowableCurrents(mag_insulation_temp_rating_C, engine_room):
+    """The Table VI-B column of each circuit, as rows by gauge."""
+    columns = np.empty((len(abyc_data.TABLE_VI_B.index), len(engine_room)))
+    for temp_C, engine in set(
+        zip(mag_insulation_temp_rating_C.tolist(), engine_room.tolist())
+    ):
+        selected = (mag_insulation_temp_rating_C == temp_C) & (engine_room == engine)
+        column = _TableVIBColumn(temp_C * pq.C, engine)
+        columns[:, selected] = column[:, np.newaxis]
+    return columns
+
+
+def GetCircuitMargins(
+    voltage,
+    current,
+    full_circuit_length,
+    insulation_temp_rating,
+    drop_pc=3,
+    engine_room=False,
+    material="copper",
+):
+    """Vectorized GetWireGaugeForDCCircuit() with the margins of each circuit.
+
+    Arguments are arrays over the circuits, or scalars shared by all of
+    them.  Tables IX and X are for copper; for any other material the
+    gauge for drop is the smallest with no more resistance than the
+    copper gauge from the tables, and the Table VI-B currents are scaled
+    by the material's ampacity_factor.  Voltages and
+    drop percentages must be those of Tables IX and X for every material.
+    Returns a CircuitMargins.
+
+    """
+    material = resistivity.GetMaterial(material)
+    shape = np.broadcast_shapes(
+        np.shape(voltage),
+        np.shape(current),
+        np.shape(full_circuit_length),
+        np.shape(insulation_temp_rating),
+        np.shape(drop_pc),
+        np.shape(engine_room),
+        (1,),
+    )
+    current_A = np.broadcast_to(current.rescale(pq.A).magnitude, shape).astype(float)
+    # As in the scalar functions, the tables are read at whole amperes.
+    mag_current_A = current_A.astype(int)
+    mag_voltage_V = np.broadcast_to(voltage.rescale(pq.V).magnitude, shape).astype(int)
+    length_ft = np.broadcast_to(full_circuit_length.rescale(pq.ft).magnitude, shape)
+    drop_pc = np.broadcast_to(drop_pc, shape)
+    mag_insulation_temp_rating_C = np.broadcast_to(
+        insulation_temp_rating.rescale(pq.C).magnitude, shape
+    ).astype(int)
+    engine_room = np.broadcast_to(np.asarray(engine_room, dtype=bool), shape)
+
+    for key in set(zip(mag_voltage_V.tolist(), drop_pc.tolist())):
+        _CheckTableIXXKey(*key)
+
+    voltage_V = np.broadcast_to(voltage.rescale(pq.V).magnitude, shape)
+    table_vi_b_awg = TableVIBAWGNumbers()
+    awg_for_drop = _AWGNumbersForDCDrop(
+        mag_voltage_V, mag_current_A, length_ft, drop_pc
+    )
+    if material is not resistivity.Copper:
+        awg_for_drop = _AWGNumbersOfEqualResistance(awg_for_drop, material)
+    allowable_A = material.ampacity_factor * _AllowableCurrents(
+        mag_insulation_temp_rating_C, engine_room
+    )
+    meets = allowable_A >= mag_current_A
+    awg_for_ampacity = np.where(
+        meets.any(axis=0), table_vi_b_awg[meets.argmax(axis=0)], np.nan
+    )
+    # The larger wire has the smaller AWG number; a gauge that cannot be met
+    # counts as larger than any.
+    drop_key = np.nan_to_num(awg_for_drop, nan=-np.inf)
+    ampacity_key = np.nan_to_num(awg_for_ampacity, nan=-np.inf)
+    binding = np.select(
+        [drop_key < ampacity_key, ampacity_key < drop_key], ["drop", "ampacity"], "both"
+    )
+    awg = np.minimum(awg_for_drop, awg_for_ampacity)
+
+    found = ~np.isnan(awg)
+    rows = np.searchsorted(-table_vi_b_awg, -awg[found])
+    circuit_allowable_A = np.full(shape, np.nan)
+    circuit_allowable_A[found] = allowable_A[rows, np.flatnonzero(found)]
+    r_ohm_per_ft = np.full(shape, np.nan)
+    r_ohm_per_ft[found] = (
+        conductor.AWGResistancePerUnitLength(awg[found].astype(int), material)
+        .rescale(pq.ohm / pq.ft)
+        .magnitude
+    )
+    circuit_drop_pc = 100.0 * current_A * r_ohm_per_ft * length_ft / voltage_V
+    return CircuitMargins(
+        awg=awg,
+        awg_for_drop=awg_for_drop,
+        awg_for_ampacity=awg_for_ampacity,
+        binding=binding,
+        allowable_current=circuit_allowable_A * pq.A,
+        ampacity_headroom=(circuit_allowable_A - current_A) * pq.A,
+        drop_pc=circuit_drop_pc,
+        drop_headroom_pc=drop_pc - circuit_drop_pc,
+    )
@@ -6,14 +6,69 @@
 
 """ABCY E-11 Tables."""
 
+import csv
+import dataclasses
 import io
 import re
 
-import pandas as pd
+import numpy as np
 
 # Reference: ABYC E-11 2008
 
 
+@dataclasses.dataclass(frozen=True)
+class Table:
+    """A read-only table of values with labelled rows and named columns.
+
+    Tables are backed by NumPy arrays so that lookups do not require
+    pandas.  Use to_frame() for a pandas DataFrame view.
+
+    """
+
+    index_name: str
+    index: np.ndarray
+    columns: tuple
+    values: np.ndarray
+
+    def __post_init__(self):
+        self.index.flags.writeable = False
+        self.values.flags.writeable = False
+
+    def __getitem__(self, column_name):
+        try:
+            return self.values[:, self.columns.index(column_name)]
+        except ValueError:
+            raise KeyError(column_name) from None
+
+    def to_frame(self):
+        """Returns the table as a pandas DataFrame (requires pandas)."""
+        import pandas as pd  # pylint: disable=import-outside-toplevel
+
+        values = self.values
+        if values.dtype.kind == "U":
+            # Missing cells are empty strings here and NaN in pandas.
+            values = np.where(values == "", None, values.astype(object))
+        return pd.DataFrame(
+            values,
+            index=pd.Index(self.index, name=self.index_name),
+            columns=list(self.columns),
+        )
+
+
+def _ReadTable(text, index_dtype, value_dtype):
+    rows = list(csv.reader(io.StringIO(text.strip())))
+    header, rows = rows[0], rows[1:]
+    n_columns = len(header) - 1
+    # Short rows are missing their trailing cells.
+    cells = [row[1:] + [""] * (n_columns - len(row) + 1) for row in rows]
+    return Table(
+        index_name=header[0],
+        index=np.array([row[0] for row in rows], dtype=index_dtype),
+        columns=tuple(header[1:]),
+        values=np.array(cells, dtype=value_dtype),
+    )
+
+
 def _ColumnSortedValues(frame, column_regex=r"\D*(\d+)\D*"):
     values = set()
     for column in frame.columns:
@@ -44,7 +99,7 @@ awg,current_60C,current_60C_engroom,current_75C,current_75C_engroom,current_80C,
 4/0,210.0,0,252.0,189.0,269.5,210.2,269.5,221.0,311.5,264.8,332.5,295.9,357.0,357.0
 """
 
-TABLE_VI_B = pd.read_csv(io.StringIO(_TABLE_VI_B_CSV)).set_index("awg")
+TABLE_VI_B = _ReadTable(_TABLE_VI_B_CSV, index_dtype=str, value_dtype=float)
 TABLE_VI_B_KNOWN_TEMPS_C = _ColumnSortedValues(TABLE_VI_B)
 
 ########################################################################
@@ -56,7 +111,7 @@ TABLE_VI_B_KNOWN_TEMPS_C = _ColumnSortedValues(TABLE_VI_B)
 #
 # 12 Volts - 3% Drop Wire Sizes (gauge) - Based on Minimum CM Area
 _TABLE_IX_12V_CSV = """
-current_A,awg_10ft,awg_15ft,awg_20ft,awg_25ft,awg_30ft,awg_40ft,awg_50ft,awg_60ft,awg_70ft,awg_80ft,awg_90ft,awg_100ft,awg_110ft,awg_120ft,awg_130ft,awg_140ft,awg_150ft,awg_160ft,awg_170
+current_A,awg_10ft,awg_15ft,awg_20ft,awg_25ft,awg_30ft,awg_40ft,awg_50ft,awg_60ft,awg_70ft,awg_80ft,awg_90ft,awg_100ft,awg_110ft,awg_120ft,awg_130ft,awg_140ft,awg_150ft,awg_160ft,awg_170ft
 5,18,16,14,12,12,10,10,10,8,8,8,6,6,6,6,6,6,6,6
 10,14,12,10,10,10,8,6,6,6,6,4,4,4,4,2,2,2,2,2
 15,12,10,10,8,8,6,6,6,4,4,2,2,2,2,2,1,1,1,1
@@ -72,13 +127,13 @@ current_A,awg_10ft,awg_15ft,awg_20ft,awg_25ft,awg_30ft,awg_40ft,awg_50ft,awg_60f
 100,4,2,2,1,0,2/0,3/0,4/0
 """
 
-TABLE_IX_12V = pd.read_csv(io.StringIO(_TABLE_IX_12V_CSV)).set_index("current_A")
+TABLE_IX_12V = _ReadTable(_TABLE_IX_12V_CSV, index_dtype=int, value_dtype=str)
 TABLE_IX_12V_KNOWN_LENGTHS_FT = _ColumnSortedValues(TABLE_IX_12V)
 
 #
 # 24 Volts - 3% Drop Wire Sizes (gauge) - Based on Minimum CM Area
 _TABLE_IX_24V_CSV = """
-current_A,awg_10ft,awg_15ft,awg_20ft,awg_25ft,awg_30ft,awg_40ft,awg_50ft,awg_60ft,awg_70ft,awg_80ft,awg_90ft,awg_100ft,awg_110ft,awg_120ft,awg_130ft,awg_140ft,awg_150ft,awg_160ft,awg_170
+current_A,awg_10ft,awg_15ft,awg_20ft,awg_25ft,awg_30ft,awg_40ft,awg_50ft,awg_60ft,awg_70ft,awg_80ft,awg_90ft,awg_100ft,awg_110ft,awg_120ft,awg_130ft,awg_140ft,awg_150ft,awg_160ft,awg_170ft
 5,18,18,18,16,16,14,12,12,12,10,10,10,10,10,8,8,8,8,8
 10,18,16,14,12,12,10,10,10,8,8,8,6,6,6,6,6,6,6,6
 15,16,14,12,12,10,10,8,8,6,6,6,6,6,4,4,4,4,4,2
@@ -94,14 +149,14 @@ current_A,awg_10ft,awg_15ft,awg_20ft,awg_25ft,awg_30ft,awg_40ft,awg_50ft,awg_60f
 100,6,6,4,4,2,2,1,0,2/0,2/0,3/0,3/0,4/0,4/0,4/0
 """
 
-TABLE_IX_24V = pd.read_csv(io.StringIO(_TABLE_IX_24V_CSV)).set_index("current_A")
+TABLE_IX_24V = _ReadTable(_TABLE_IX_24V_CSV, index_dtype=int, value_dtype=str)
 TABLE_IX_24V_KNOWN_LENGTHS_FT = _ColumnSortedValues(TABLE_IX_24V)
 
 
 #
 # 32 Volts - 3% Drop Wire Sizes (gauge) - Based on Minimum CM Area
 _TABLE_IX_32V_CSV = """
-current_A,awg_10ft,awg_15ft,awg_20ft,awg_25ft,awg_30ft,awg_40ft,awg_50ft,awg_60ft,awg_70ft,awg_80ft,awg_90ft,awg_100ft,awg_110ft,awg_120ft,awg_130ft,awg_140ft,awg_150ft,awg_160ft,awg_170
+current_A,awg_10ft,awg_15ft,awg_20ft,awg_25ft,awg_30ft,awg_40ft,awg_50ft,awg_60ft,awg_70ft,awg_80ft,awg_90ft,awg_100ft,awg_110ft,awg_120ft,awg_130ft,awg_140ft,awg_150ft,awg_160ft,awg_170ft
 5,18,18,18,18,16,16,14,14,12,12,12,12,10,10,10,10,10,10,8
 10,18,16,16,14,14,12,12,10,10,10,8,8,8,8,8,6,6,6,6
 15,16,14,14,12,12,10,10,8,8,8,6,6,6,6,6,6,6,4,4
@@ -117,7 +172,7 @@ current_A,awg_10ft,awg_15ft,awg_20ft,awg_25ft,awg_30ft,awg_40ft,awg_50ft,awg_60f
 100,8,6,6,4,4,2,2,1,0,0,2/0,2/0,2/0,3/0,3/0,3/0,4/0,4/0,4/0
 """
 
-TABLE_IX_32V = pd.read_csv(io.StringIO(_TABLE_IX_32V_CSV)).set_index("current_A")
+TABLE_IX_32V = _ReadTable(_TABLE_IX_32V_CSV, index_dtype=int, value_dtype=str)
 TABLE_IX_32V_KNOWN_LENGTHS_FT = _ColumnSortedValues(TABLE_IX_32V)
 
 ########################################################################
@@ -129,7 +184,7 @@ TABLE_IX_32V_KNOWN_LENGTHS_FT = _ColumnSortedValues(TABLE_IX_32V)
 #
 # 12 Volts - 10% Drop Wire Sizes (gauge) - Based on Minimum CM Area
 _TABLE_X_12V_CSV = """
-current_A,awg_10ft,awg_15ft,awg_20ft,awg_25ft,awg_30ft,awg_40ft,awg_50ft,awg_60ft,awg_70ft,awg_80ft,awg_90ft,awg_100ft,awg_110ft,awg_120ft,awg_130ft,awg_140ft,awg_150ft,awg_160ft,awg_170
+current_A,awg_10ft,awg_15ft,awg_20ft,awg_25ft,awg_30ft,awg_40ft,awg_50ft,awg_60ft,awg_70ft,awg_80ft,awg_90ft,awg_100ft,awg_110ft,awg_120ft,awg_130ft,awg_140ft,awg_150ft,awg_160ft,awg_170ft
 5,18,18,18,18,18,16,16,14,14,14,12,12,12,12,12,10,10,10,10
 10,18,18,16,16,14,14,12,12,10,10,10,10,8,8,8,8,8,8,6
 15,18,16,14,14,12,12,10,10,8,8,8,8,8,6,6,6,6,6,6
@@ -145,14 +200,14 @@ current_A,awg_10ft,awg_15ft,awg_20ft,awg_25ft,awg_30ft,awg_40ft,awg_50ft,awg_60f
 100,10,8,6,6,4,4,2,2,1,1,0,0,0,2/0,2/0,2/0,3/0,3/0,3/0
 """
 
-TABLE_X_12V = pd.read_csv(io.StringIO(_TABLE_X_12V_CSV)).set_index("current_A")
+TABLE_X_12V = _ReadTable(_TABLE_X_12V_CSV, index_dtype=int, value_dtype=str)
 TABLE_X_12V_KNOWN_LENGTHS_FT = _ColumnSortedValues(TABLE_X_12V)
 
 
 #
 # 24 Volts - 10% Drop Wire Sizes (gauge) - Based on Minimum CM Area
 _TABLE_X_24V_CSV = """
-current_A,awg_10ft,awg_15ft,awg_20ft,awg_25ft,awg_30ft,awg_40ft,awg_50ft,awg_60ft,awg_70ft,awg_80ft,awg_90ft,awg_100ft,awg_110ft,awg_120ft,awg_130ft,awg_140ft,awg_150ft,awg_160ft,awg_170
+current_A,awg_10ft,awg_15ft,awg_20ft,awg_25ft,awg_30ft,awg_40ft,awg_50ft,awg_60ft,awg_70ft,awg_80ft,awg_90ft,awg_100ft,awg_110ft,awg_120ft,awg_130ft,awg_140ft,awg_150ft,awg_160ft,awg_170ft
 5,18,18,18,18,18,18,18,18,16,16,16,16,14,14,14,14,14,14,12
 10,18,18,18,18,18,16,16,14,14,14,12,12,12,12,12,10,10,10,10
 15,18,18,18,16,16,14,14,12,12,12,10,10,10,10,10,8,8,8,8
@@ -168,14 +223,14 @@ current_A,awg_10ft,awg_15ft,awg_20ft,awg_25ft,awg_30ft,awg_40ft,awg_50ft,awg_60f
 100,12,10,10,8,8,6,6,4,4,4,2,2,2,2,2,1,1,1,1
 """
 
-TABLE_X_24V = pd.read_csv(io.StringIO(_TABLE_X_24V_CSV)).set_index("current_A")
+TABLE_X_24V = _ReadTable(_TABLE_X_24V_CSV, index_dtype=int, value_dtype=str)
 TABLE_X_24V_KNOWN_LENGTHS_FT = _ColumnSortedValues(TABLE_X_24V)
 
 
 #
 # 32 Volts - 10% Drop Wire Sizes (gauge) - Based on Minimum CM Area
 _TABLE_X_32V_CSV = """
-current_A,awg_10ft,awg_15ft,awg_20ft,awg_25ft,awg_30ft,awg_40ft,awg_50ft,awg_60ft,awg_70ft,awg_80ft,awg_90ft,awg_100ft,awg_110ft,awg_120ft,awg_130ft,awg_140ft,awg_150ft,awg_160ft,awg_170
+current_A,awg_10ft,awg_15ft,awg_20ft,awg_25ft,awg_30ft,awg_40ft,awg_50ft,awg_60ft,awg_70ft,awg_80ft,awg_90ft,awg_100ft,awg_110ft,awg_120ft,awg_130ft,awg_140ft,awg_150ft,awg_160ft,awg_170ft
 5,18,18,18,18,18,18,18,18,18,18,18,16,16,16,16,14,14,14,14
 10,18,18,18,18,18,18,16,16,14,14,14,14,14,12,12,12,12,12,12
 15,18,18,18,18,18,16,14,14,14,12,12,12,12,10,10,10,10,10,10
@@ -191,5 +246,5 @@ current_A,awg_10ft,awg_15ft,awg_20ft,awg_25ft,awg_30ft,awg_40ft,awg_50ft,awg_60f
 100,14,12,10,10,8,8,6,6,6,4,4,4,4,2,2,2,2,2,2
 """
 
-TABLE_X_32V = pd.read_csv(io.StringIO(_TABLE_X_32V_CSV)).set_index("current_A")
+TABLE_X_32V = _ReadTable(_TABLE_X_32V_CSV, index_dtype=int, value_dtype=str)
 TABLE_X_32V_KNOWN_LENGTHS_FT = _ColumnSortedValues(TABLE_X_32V)
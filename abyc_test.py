@@ -9,10 +9,17 @@
 # pylint: disable=missing-function-docstring
 # pylint: disable=invalid-name
 
+import itertools
+import pathlib
+import subprocess
+import sys
+
+import numpy as np
 import pytest
 import quantities as pq
 
-from . import abyc
+from . import abyc, abyc_data, conductor, wire
+from .test_utils import isclose
 
 
 def testGetWireGaugeUpToThreeCounductorBundle11A60C():
@@ -65,6 +72,32 @@ def testGetWireGaugeUpToThreeCounductorBundleTooHigh():
         )
 
 
+def testGetAWGNumbersUpToThreeConductorBundle():
+    currents = np.arange(0.0, 331.0, 0.5)
+    for temp, engine_room in itertools.product((60, 105, 200), (False, True)):
+        expected = []
+        for current in currents:
+            try:
+                expected.append(
+                    conductor.AWGNumbers(
+                        abyc.GetWireGaugeUpToThreeConductorBundle(
+                            current * pq.A, temp * pq.C, engine_room=engine_room
+                        )
+                    )
+                )
+            except ValueError:
+                break
+        got = abyc.GetAWGNumbersUpToThreeConductorBundle(
+            currents[: len(expected)] * pq.A, temp * pq.C, engine_room=engine_room
+        )
+        assert np.array_equal(got, expected)
+
+
+def testGetAWGNumbersUpToThreeConductorBundleTooHigh():
+    with pytest.raises(ValueError):
+        abyc.GetAWGNumbersUpToThreeConductorBundle([10.0, 400.0] * pq.A, 105 * pq.C)
+
+
 def testGetWireGaugeForDCCircuitTest_15A_60C():
     assert abyc.GetWireGaugeUpToThreeConductorBundle(15.0 * pq.A, 60 * pq.C) == 12
 
@@ -118,6 +151,10 @@ def testGetWireGaugeForDrop_24V_8A_50FT_10PC():
     )
 
 
+def testGetWireGaugeForDCDrop_12V_20A_170FT():
+    assert abyc.GetWireGaugeForDCDrop(12.0 * pq.V, 20.0 * pq.A, 165.0 * pq.ft) == "2/0"
+
+
 ########################################################################
 
 
@@ -174,6 +211,34 @@ def testGetWireGaugeForDCCircuit_12V_15A_50FT():
     )
 
 
+def testGetWireGaugeForDCCircuit_12V_90A_60FT():
+    # Drop needs 4/0, ampacity only 2.
+    assert (
+        abyc.GetWireGaugeForDCCircuit(12.0 * pq.V, 90.0 * pq.A, 60.0 * pq.ft, 60 * pq.C)
+        == "4/0"
+    )
+
+
+def testGetWireGaugeForDCCircuit_12V_90A_60FT_Metric():
+    assert abyc.GetWireGaugeForDCCircuit(
+        12.0 * pq.V, 90.0 * pq.A, 60.0 * pq.ft, 60 * pq.C, metric=True
+    ) == (120.0 * pq.mm**2)
+
+
+def testGetWireGaugeUpToThreeConductorBundle11A60CMetric():
+    # AWG 14 is 2.08 mm^2.
+    assert abyc.GetWireGaugeUpToThreeConductorBundle(
+        11 * pq.A, 60 * pq.C, metric=True
+    ) == (2.5 * pq.mm**2)
+
+
+def testGetWireGaugeForDCDrop_24V_24A_71FT_Metric():
+    # AWG 4 is 21.2 mm^2.
+    assert abyc.GetWireGaugeForDCDrop(
+        24.0 * pq.V, 24.0 * pq.A, 71.0 * pq.ft, metric=True
+    ) == (25.0 * pq.mm**2)
+
+
 def testGetWireGaugeForDCCircuit_24V_8A_50FT_10PC():
     assert (
         abyc.GetWireGaugeForDCCircuit(
@@ -181,3 +246,148 @@ def testGetWireGaugeForDCCircuit_24V_8A_50FT_10PC():
         )
         == 16
     )
+
+
+########################################################################
+
+
+def testGetCircuitMarginsMatchesScalar():
+    circuits = list(
+        itertools.product(
+            (12, 24, 32), (4, 15, 24, 80, 150), (9, 50, 71, 171), (60, 105), (3, 10)
+        )
+    )
+    voltage, current, length, temp, drop_pc = (np.array(c) for c in zip(*circuits))
+    margins = abyc.GetCircuitMargins(
+        voltage * pq.V, current * pq.A, length * pq.ft, temp * pq.C, drop_pc=drop_pc
+    )
+    for i, (v, c, l, t, d) in enumerate(circuits):
+        try:
+            expected = conductor.AWGNumbers(
+                abyc.GetWireGaugeForDCCircuit(
+                    v * pq.V, c * pq.A, l * pq.ft, t * pq.C, drop_pc=d
+                )
+            )
+        except ValueError:
+            assert np.isnan(margins.awg[i])
+        else:
+            assert margins.awg[i] == expected
+
+
+def testGetCircuitMargins():
+    margins = abyc.GetCircuitMargins(
+        [12, 24, 12] * pq.V,
+        [4, 24, 80] * pq.A,
+        [9, 71, 100] * pq.ft,
+        105 * pq.C,
+        drop_pc=[3, 10, 3],
+    )
+    # 4 A over 9 ft needs the smallest gauge either way, 24 A over 71 ft is
+    # sized by drop and 80 A over 100 ft cannot meet its drop.
+    assert np.array_equal(margins.awg_for_drop[:2], [18, 10])
+    assert np.isnan(margins.awg_for_drop[2])
+    assert np.array_equal(margins.awg_for_ampacity, [18, 14, 6])
+    assert list(margins.binding) == ["both", "drop", "drop"]
+    assert np.isnan(margins.awg[2])
+    assert isclose(margins.allowable_current[1], 42.0 * pq.A, 1e-9 * pq.A)
+    assert isclose(margins.ampacity_headroom[1], 18.0 * pq.A, 1e-9 * pq.A)
+    drop = 24 * pq.A * wire.SolidWireResistancePerUnitLength(10) * 71 * pq.ft
+    drop_pc = float((100.0 * drop / (24 * pq.V)).simplified)
+    assert np.isclose(margins.drop_pc[1], drop_pc)
+    assert np.isclose(margins.drop_headroom_pc[1], 10.0 - drop_pc)
+
+
+@pytest.mark.parametrize("material", ["copper", "aluminum"])
+def testGetWireGaugeForDCCircuitTableKey(material):
+    with pytest.raises(ValueError):
+        abyc.GetWireGaugeForDCCircuit(
+            13 * pq.V, 20 * pq.A, 30 * pq.ft, 105 * pq.C, material=material
+        )
+    with pytest.raises(ValueError):
+        abyc.GetWireGaugeForDCCircuit(
+            12 * pq.V, 20 * pq.A, 30 * pq.ft, 105 * pq.C, drop_pc=5, material=material
+        )
+
+
+def testGetCircuitMarginsScalarCurrent():
+    lengths = [10, 20, 40] * pq.ft
+    margins = abyc.GetCircuitMargins(12 * pq.V, 10 * pq.A, lengths, 105 * pq.C)
+    expected = abyc.GetCircuitMargins(12 * pq.V, [10] * 3 * pq.A, lengths, 105 * pq.C)
+    assert margins.awg.shape == (3,)
+    assert np.array_equal(margins.awg, expected.awg)
+    assert np.allclose(margins.drop_pc, expected.drop_pc)
+
+
+def testGetCircuitMarginsAluminum():
+    args = ([12, 24] * pq.V, [20, 100] * pq.A, [30, 10] * pq.ft, 105 * pq.C)
+    copper = abyc.GetCircuitMargins(*args)
+    aluminum = abyc.GetCircuitMargins(*args, material="aluminum")
+    assert np.all(aluminum.awg < copper.awg)
+    assert np.all(aluminum.drop_headroom_pc >= 0.0)
+    assert np.all(aluminum.ampacity_headroom >= 0.0 * pq.A)
+    assert list(aluminum.binding) == ["drop", "ampacity"]
+    assert abyc.GetWireGaugeForDCCircuit(
+        12 * pq.V, 20 * pq.A, 30 * pq.ft, 105 * pq.C, material="aluminum"
+    ) == wire.CanonicalizeAWG(int(aluminum.awg[0]))
+
+
+@pytest.mark.parametrize("drop_pc", [3, 10])
+def testGetCircuitMarginsMoreResistiveIsNeverSmaller(drop_pc):
+    currents, lengths = np.meshgrid(np.arange(1, 120, 3), np.arange(5, 200, 15))
+    args = (12 * pq.V, np.ravel(currents) * pq.A, np.ravel(lengths) * pq.ft)
+    larger_awg = np.inf
+    for material in ("copper", "tinned copper", "copper-clad aluminum", "aluminum"):
+        margins = abyc.GetCircuitMargins(
+            *args, 105 * pq.C, drop_pc=drop_pc, material=material
+        )
+        # No gauge at all counts as larger than any.
+        awg = np.nan_to_num(margins.awg, nan=-np.inf)
+        assert np.all(awg <= larger_awg)
+        larger_awg = awg
+    for material in ("tinned copper", "aluminum"):
+        awg = abyc.GetWireGaugeForDCCircuit(
+            12 * pq.V, 10 * pq.A, 20 * pq.ft, 105 * pq.C, material=material
+        )
+        assert wire.AWGSpecificationToNumber(awg) <= 10
+
+
+def testCircuitMarginsToFrame():
+    pytest.importorskip("pandas")
+    margins = abyc.GetCircuitMargins(
+        12 * pq.V, [4, 40] * pq.A, 20 * pq.ft, 105 * pq.C, engine_room=[False, True]
+    )
+    frame = margins.to_frame()
+    assert list(frame.columns[:4]) == [
+        "awg",
+        "awg_for_drop",
+        "awg_for_ampacity",
+        "binding",
+    ]
+    assert frame.sort_values("drop_headroom_pc")["awg"].iloc[0] == margins.awg[1]
+
+
+def testTablesAreReadOnly():
+    with pytest.raises(ValueError):
+        abyc_data.TABLE_VI_B["current_60C"][0] = 100.0
+
+
+def testTableUnknownColumn():
+    with pytest.raises(KeyError):
+        abyc_data.TABLE_IX_12V["awg_180ft"]
+
+
+def testTableToFrame():
+    pytest.importorskip("pandas")
+    frame = abyc_data.TABLE_IX_12V.to_frame()
+    assert frame.index.name == "current_A"
+    assert frame.loc[20, "awg_170ft"] == "2/0"
+    assert frame["awg_170ft"].isna().sum() == 6
+
+
+def testImportWithoutPandas():
+    package_dir = pathlib.Path(__file__).resolve().parent
+    code = (
+        f"import sys; import {package_dir.name}.abyc; "
+        "assert 'pandas' not in sys.modules"
+    )
+    subprocess.run([sys.executable, "-c", code], cwd=package_dir.parent, check=True)
@@ -0,0 +1,181 @@
+#
+# Copyright (c) 2023, Christopher Hoover
+#
+# SPDX-License-Identifier: BSD-3-Clause
+#
+
+"""Parallel batch evaluation of engmath calls."""
+
+import collections
+import concurrent.futures
+import dataclasses
+import math
+import os
+import sys
+import threading
+import time
+
+import numpy as np
+import quantities as pq
+
+from . import abyc_data
+
+BACKENDS = ("thread", "process")
+
+
+@dataclasses.dataclass(frozen=True)
+class ChunkTiming:
+    """Where and for how long one chunk ran."""
+
+    start: int
+    stop: int
+    seconds: float
+    worker: str
+
+
+@dataclasses.dataclass(frozen=True)
+class BatchResult:
+    """Result of BatchMap()."""
+
+    values: object
+    chunks: tuple
+    wall_seconds: float
+
+    @property
+    def worker_seconds(self):
+        "Returns the busy time of each worker."
+        busy = collections.defaultdict(float)
+        for chunk in self.chunks:
+            busy[chunk.worker] += chunk.seconds
+        return dict(busy)
+
+    @property
+    def load_balance(self):
+        "Returns the busiest worker's time over the mean (1.0 is perfect)."
+        busy = list(self.worker_seconds.values())
+        if not busy or sum(busy) == 0.0:
+            return 1.0
+        return max(busy) / (sum(busy) / len(busy))
+
+
+def DefaultBackend():
+    """Threads where the interpreter runs them in parallel, else processes."""
+    is_gil_enabled = getattr(sys, "_is_gil_enabled", lambda: True)
+    return "process" if is_gil_enabled() else "thread"
+
+
+def _CheckTablesReadOnly():
+    # Threads share the ABYC tables, which must therefore never be written.
+    for name in dir(abyc_data):
+        table = getattr(abyc_data, name)
+        if isinstance(table, abyc_data.Table) and (
+            table.index.flags.writeable or table.values.flags.writeable
+        ):
+            raise RuntimeError(f"abyc_data.{name} is writeable.")
+
+
+def _RunChunk(function, vectorized, args, kwargs):
+    began = time.perf_counter()
+    if vectorized:
+        values = function(*args, **kwargs)
+    else:
+        values = [function(*element, **kwargs) for element in zip(*args)]
+    worker = f"{os.getpid()}:{threading.get_ident()}"
+    return values, time.perf_counter() - began, worker
+
+
+def _Concatenate(parts):
+    """Joins the chunk results along their first axis.
+
+    Dataclass results, such as abyc.CircuitMargins, are joined field by
+    field.
+
+    """
+    if parts and all(isinstance(part, pq.Quantity) for part in parts):
+        units = parts[0].units
+        return pq.Quantity(
+            np.concatenate([part.rescale(units).magnitude for part in parts]), units
+        )
+    if parts and all(isinstance(part, np.ndarray) for part in parts):
+        return np.concatenate(parts)
+    if parts and dataclasses.is_dataclass(parts[0]):
+        if any(type(part) is not type(parts[0]) for part in parts):
+            raise TypeError("Chunks returned different result types.")
+        return dataclasses.replace(
+            parts[0],
+            **{
+                field.name: _Concatenate([getattr(part, field.name) for part in parts])
+                for field in dataclasses.fields(parts[0])
+            },
+        )
+    if all(isinstance(part, (list, tuple)) for part in parts):
+        return [value for part in parts for value in part]
+    raise TypeError(
+        f"Cannot concatenate chunk results of type {type(parts[0]).__name__}."
+    )
+
+
+def BatchMap(
+    function,
+    *args,
+    vectorized=True,
+    backend=None,
+    max_workers=None,
+    chunk_size=None,
+    **kwargs,
+):
+    """Evaluates function over the rows of args in parallel chunks.
+
+    The positional args are sequences or arrays of equal length that are
+    split into chunks along their first axis; kwargs are passed to every
+    call unchanged.  If vectorized, function is called once per chunk with
+    the sliced args and the chunk results, which may be arrays,
+    quantities or dataclasses of them, are concatenated.  Otherwise it
+    is called once per row and the values are returned as a list.
+
+    backend is "thread" or "process" (DefaultBackend() if None).  A process
+    backend needs a picklable function, such as any engmath module-level
+    function.
+
+    """
+    if backend is None:
+        backend = DefaultBackend()
+    if backend not in BACKENDS:
+        raise ValueError(f"Unknown backend {backend}; known backends: {BACKENDS}")
+    lengths = {len(arg) for arg in args}
+    if len(lengths) != 1:
+        raise ValueError("Arguments must all have the same length.")
+    (n,) = lengths
+    if max_workers is None:
+        max_workers = os.cpu_count() or 1
+    if chunk_size is None:
+        chunk_size = max(1, math.ceil(n / (4 * max_workers)))
+    bounds = [(start, min(start + chunk_size, n)) for start in range(0, n, chunk_size)]
+    _CheckTablesReadOnly()
+
+    if backend == "thread":
+        executor_class = concurrent.futures.ThreadPoolExecutor
+    else:
+        executor_class = concurrent.futures.ProcessPoolExecutor
+    began = time.perf_counter()
+    with executor_class(max_workers) as executor:
+        futures = [
+            executor.submit(
+                _RunChunk,
+                function,
+                vectorized,
+                [arg[start:stop] for arg in args],
+                kwargs,
+            )
+            for start, stop in bounds
+        ]
+        results = [future.result() for future in futures]
+    wall_seconds = time.perf_counter() - began
+
+    chunks = tuple(
+        ChunkTiming(start=start, stop=stop, seconds=seconds, worker=worker)
+        for (start, stop), (_, seconds, worker) in zip(bounds, results)
+    )
+    parts = [values for values, _, _ in results]
+    values = _Concatenate(parts) if vectorized else [v for p in parts for v in p]
+    return BatchResult(values=values, chunks=chunks, wall_seconds=wall_seconds)
@@ -0,0 +1,119 @@
+#
+# Copyright (c) 2023, Christopher Hoover
+#
+# SPDX-License-Identifier: BSD-3-Clause
+#
+
+"""Batch test."""
+
+# pylint: disable=missing-function-docstring
+# pylint: disable=invalid-name
+
+import numpy as np
+import pytest
+import quantities as pq
+
+from . import abyc, batch, wearable, wire
+
+
+def _Flux(ambient_temp, h):
+    # A vectorized stand-in for engmath calls over arrays.
+    return (h * (43.0 * pq.C - ambient_temp)).rescale(pq.mW / pq.mm**2)
+
+
+@pytest.mark.parametrize("backend", batch.BACKENDS)
+def testBatchMapElementwise(backend):
+    currents = np.arange(1.0, 60.0, 3.0) * pq.A
+    lengths = np.linspace(10.0, 100.0, len(currents)) * pq.ft
+    result = batch.BatchMap(
+        abyc.GetWireGaugeForDCDrop,
+        [12.0 * pq.V] * len(currents),
+        currents,
+        lengths,
+        vectorized=False,
+        backend=backend,
+        max_workers=2,
+        chunk_size=3,
+        drop_pc=10,
+    )
+    expected = [
+        abyc.GetWireGaugeForDCDrop(12.0 * pq.V, current, length, drop_pc=10)
+        for current, length in zip(currents, lengths)
+    ]
+    assert result.values == expected
+    assert len(result.chunks) == 7
+    assert [(chunk.start, chunk.stop) for chunk in result.chunks][-1] == (18, 20)
+    assert result.load_balance >= 1.0
+
+
+@pytest.mark.parametrize("backend", batch.BACKENDS)
+def testBatchMapVectorized(backend):
+    ambient_temps = np.linspace(0.0, 40.0, 101) * pq.C
+    h = 12.0 * pq.W / (pq.m**2 * pq.C)
+    result = batch.BatchMap(
+        _Flux, ambient_temps, h=h, backend=backend, max_workers=2, chunk_size=10
+    )
+    assert result.values.units == pq.mW / pq.mm**2
+    assert np.allclose(result.values.magnitude, _Flux(ambient_temps, h).magnitude)
+    assert sum(result.worker_seconds.values()) > 0.0
+
+
+def testBatchMapEmpty():
+    result = batch.BatchMap(wire.SolidWireDiameter, [], vectorized=False)
+    assert result.values == []
+    assert result.chunks == ()
+    assert result.load_balance == 1.0
+
+
+def testBatchMapLengthMismatch():
+    with pytest.raises(ValueError):
+        batch.BatchMap(abyc.GetWireGaugeForDCDrop, [1], [1, 2], [3])
+
+
+def testBatchMapUnknownBackend():
+    with pytest.raises(ValueError):
+        batch.BatchMap(wire.SolidWireDiameter, [18], backend="gpu")
+
+
+def testBatchMapDataclassResults():
+    n = 50
+    voltages = np.where(np.arange(n) % 2, 12.0, 24.0) * pq.V
+    currents = np.linspace(1.0, 120.0, n) * pq.A
+    lengths = np.linspace(5.0, 150.0, n) * pq.ft
+    result = batch.BatchMap(
+        abyc.GetCircuitMargins,
+        voltages,
+        currents,
+        lengths,
+        insulation_temp_rating=105 * pq.C,
+        backend="thread",
+        chunk_size=7,
+    )
+    expected = abyc.GetCircuitMargins(voltages, currents, lengths, 105 * pq.C)
+    assert np.array_equal(result.values.awg, expected.awg, equal_nan=True)
+    assert np.array_equal(result.values.binding, expected.binding)
+    assert np.allclose(
+        result.values.ampacity_headroom.magnitude,
+        expected.ampacity_headroom.magnitude,
+        equal_nan=True,
+    )
+
+
+def testBatchMapSweep():
+    ambient_temps = np.linspace(0.0, 40.0, 20) * pq.C
+    powers, areas = [0.1, 0.5] * pq.W, [10.0, 50.0] * pq.cm**2
+    result = batch.BatchMap(
+        wearable.TouchSurfacePassiveSweep,
+        ambient_temps,
+        powers=powers,
+        areas=areas,
+        backend="thread",
+        chunk_size=3,
+    )
+    expected = wearable.TouchSurfacePassiveSweep(ambient_temps, powers, areas)
+    assert np.array_equal(result.values.feasible, expected.feasible)
+
+
+def testBatchMapUnsupportedResult():
+    with pytest.raises(TypeError):
+        batch.BatchMap(len, [[1], [2]], backend="thread")
@@ -0,0 +1,491 @@
+#
+# Copyright (c) 2023, Christopher Hoover
+#
+# SPDX-License-Identifier: BSD-3-Clause
+#
+
+"""Assignment of circuits to bundles and routes (ABYC E-11 Table VI-B)."""
+
+import concurrent.futures
+import dataclasses
+import math
+import os
+
+import numpy as np
+import quantities as pq
+
+from . import abyc, wire
+
+# Table VI-B allows up to three current carrying conductors per bundle.
+MAX_CONDUCTORS_PER_BUNDLE = 3
+
+
+@dataclasses.dataclass(frozen=True)
+class Circuit:
+    """A DC circuit to be routed.
+
+    n_conductors is the number of current carrying conductors the circuit
+    adds to its bundle (2 for a supply and return run together).  routes
+    names the candidate routes; empty means any route.
+
+    """
+
+    name: str
+    voltage: pq.Quantity
+    current: pq.Quantity
+    drop_pc: int = 3
+    n_conductors: int = 2
+    routes: tuple = ()
+
+
+@dataclasses.dataclass(frozen=True)
+class Route:
+    """A path through the boat that holds up to max_bundles bundles."""
+
+    name: str
+    length: pq.Quantity
+    max_bundles: int
+    insulation_temp_rating: pq.Quantity
+    engine_room: bool = False
+
+
+@dataclasses.dataclass(frozen=True)
+class BundleAssignment:
+    """Placement and gauge of one circuit."""
+
+    circuit: str
+    route: str
+    bundle: int
+    awg: object
+
+
+@dataclasses.dataclass(frozen=True)
+class BundlePlan:
+    """Result of OptimizeBundles().
+
+    optimal is False if the search stopped at max_nodes before proving
+    that the plan is the best one; no plan uses less copper than
+    lower_bound.
+
+    """
+
+    assignments: tuple
+    copper_volume: float
+    lower_bound: float
+    optimal: bool
+    nodes: int
+
+
+def BundlesNeeded(n1, n2, n3):
+    """The fewest bundles that hold n1, n2 and n3 circuits of one, two and
+    three conductors without splitting a circuit across bundles.
+
+    """
+    # A two conductor circuit has room for one single conductor beside it.
+    return n3 + n2 + math.ceil(max(0, n1 - n2) / MAX_CONDUCTORS_PER_BUNDLE)
+
+
+def _PackBundles(n_conductors):
+    """Bundle numbers for circuits on one route, packed as BundlesNeeded()."""
+    bundles = [None] * len(n_conductors)
+    n_bundles = 0
+    # Bundles holding a two conductor circuit have room for one more.
+    spare = []
+    for i, n in enumerate(n_conductors):
+        if n > 1:
+            bundles[i] = n_bundles
+            if n == 2:
+                spare.append(n_bundles)
+            n_bundles += 1
+    room = 0
+    for i, n in enumerate(n_conductors):
+        if n == 1:
+            if spare:
+                bundles[i] = spare.pop(0)
+                continue
+            if room == 0:
+                n_bundles += 1
+                room = MAX_CONDUCTORS_PER_BUNDLE
+            bundles[i] = n_bundles - 1
+            room -= 1
+    return bundles
+
+
+def _CircuitGauge(circuit, route):
+    """The AWG number required for the circuit on the route, or None."""
+    try:
+        awg_for_drop = abyc.GetWireGaugeForDCDrop(
+            circuit.voltage,
+            circuit.current,
+            2.0 * route.length,
+            drop_pc=circuit.drop_pc,
+        )
+        awg_for_bundle = abyc.GetWireGaugeUpToThreeConductorBundle(
+            circuit.current,
+            route.insulation_temp_rating,
+            engine_room=route.engine_room,
+        )
+    except ValueError:
+        return None
+    return min(
+        wire.AWGSpecificationToNumber(awg_for_drop),
+        wire.AWGSpecificationToNumber(awg_for_bundle),
+    )
+
+
+def _Fits(counts, max_bundles, n_conductors):
+    counts[n_conductors] += 1
+    fits = BundlesNeeded(counts[1], counts[2], counts[3]) <= max_bundles
+    counts[n_conductors] -= 1
+    return fits
+
+
+def _Usage(sizes):
+    """How much of each relaxed route limit a circuit uses.
+
+    A route with B bundles holds at most 3 * B conductors and at most B
+    circuits of two or three conductors.
+
+    """
+    sizes = np.asarray(sizes, dtype=float)
+    return np.stack([sizes, (sizes > 1).astype(float)], axis=1)
+
+
+def _Capacities(max_bundles):
+    max_bundles = np.asarray(max_bundles, dtype=float)
+    return np.stack([MAX_CONDUCTORS_PER_BUNDLE * max_bundles, max_bundles], axis=1)
+
+
+def _Multipliers(costs, usage, capacities, upper_bound, n_iterations=200):
+    """Lagrange multipliers for the relaxed route limits.
+
+    Relaxing the limits of _Usage() with multipliers m >= 0 bounds every
+    plan from below by sum_i min_r(costs[i, r] + usage[i] . m[r]) -
+    sum_r capacities[r] . m[r].  The multipliers that make this tightest
+    are found by subgradient ascent.
+
+    """
+    multipliers = np.zeros_like(capacities)
+    best_bound, best_multipliers = -np.inf, multipliers
+    if not np.isfinite(upper_bound):
+        upper_bound = costs[np.isfinite(costs)].sum()
+    rows = np.arange(costs.shape[0])
+    theta = 2.0
+    stalled = 0
+    for _ in range(n_iterations):
+        reduced = costs + usage @ multipliers.T
+        chosen = np.argmin(reduced, axis=1)
+        bound = reduced[rows, chosen].sum() - (multipliers * capacities).sum()
+        if bound > best_bound:
+            stalled = 0 if bound > best_bound + 1e-6 * abs(bound) else stalled + 1
+            best_bound, best_multipliers = bound, multipliers
+        else:
+            stalled += 1
+        if stalled >= 10:
+            theta /= 2.0
+            stalled = 0
+        used = np.zeros_like(capacities)
+        np.add.at(used, chosen, usage)
+        gradient = used - capacities
+        # Limits that are met and carry no multiplier need no change.
+        gradient[(multipliers == 0.0) & (gradient < 0.0)] = 0.0
+        norm = (gradient * gradient).sum()
+        if norm == 0.0 or theta < 1e-4:
+            break
+        step = theta * max(upper_bound - bound, 1e-9 * upper_bound) / norm
+        multipliers = np.maximum(0.0, multipliers + step * gradient)
+    return best_multipliers
+
+
+@dataclasses.dataclass(frozen=True)
+class _Problem:
+    """Search tree for OptimizeBundles(), one level per circuit."""
+
+    # (reduced cost, cost, route) tuples sorted by reduced cost.
+    choices: list
+    sizes: list
+    max_bundles: list
+    # True where a circuit is interchangeable with the one before it.
+    same_as_previous: list
+    # Sums of the cheapest reduced costs from each level on.
+    suffix_bounds: list
+    # -sum_r capacities[r] . m[r]; see _Multipliers().
+    base_bound: float
+
+
+def _Limit(best_cost):
+    # Only look for plans that are better by more than rounding error.
+    return best_cost * (1.0 - 1e-9)
+
+
+def _BranchAndBound(problem, prefix, best_cost, max_nodes):
+    """Depth first search of the subtree below the given choice prefix.
+
+    Returns (cost, routes, nodes, complete) for the best plan cheaper than
+    best_cost, with routes None if there is none.
+
+    """
+    choices, sizes, suffix_bounds = (
+        problem.choices,
+        problem.sizes,
+        problem.suffix_bounds,
+    )
+    n = len(choices)
+    counts = [[0] * (MAX_CONDUCTORS_PER_BUNDLE + 1) for _ in problem.max_bundles]
+    routes, taken, chosen = [], [], []
+    cost, base = 0.0, problem.base_bound
+    for level, k in enumerate(prefix):
+        reduced, c, r = choices[level][k]
+        if not _Fits(counts[r], problem.max_bundles[r], sizes[level]):
+            return best_cost, None, 0, True
+        counts[r][sizes[level]] += 1
+        routes.append(r)
+        taken.append((reduced, c))
+        chosen.append(k)
+        cost += c
+        base += reduced
+    start = len(prefix)
+    if start == n:
+        if cost < _Limit(best_cost):
+            return cost, routes, 0, True
+        return best_cost, None, 0, True
+
+    best_routes = None
+    limit = _Limit(best_cost)
+    positions = [0] * (n + 1)
+    if start > 0 and problem.same_as_previous[start]:
+        positions[start] = chosen[-1]
+    level = start
+    nodes = 0
+    while level >= start:
+        if nodes >= max_nodes:
+            return best_cost, best_routes, nodes, False
+        descended = False
+        for k in range(positions[level], len(choices[level])):
+            reduced, c, r = choices[level][k]
+            # Choices are sorted by reduced cost, so nothing further can do
+            # better.
+            if base + reduced + suffix_bounds[level + 1] >= limit:
+                break
+            if not _Fits(counts[r], problem.max_bundles[r], sizes[level]):
+                continue
+            nodes += 1
+            if level + 1 == n:
+                if cost + c < limit:
+                    best_cost, best_routes = cost + c, routes + [r]
+                    limit = _Limit(best_cost)
+                continue
+            positions[level] = k + 1
+            counts[r][sizes[level]] += 1
+            routes.append(r)
+            taken.append((reduced, c))
+            chosen.append(k)
+            cost += c
+            base += reduced
+            level += 1
+            # Interchangeable circuits take their choices in order.
+            positions[level] = k if problem.same_as_previous[level] else 0
+            descended = True
+            break
+        if descended:
+            continue
+        level -= 1
+        if level >= start:
+            r = routes.pop()
+            counts[r][sizes[level]] -= 1
+            reduced, c = taken.pop()
+            chosen.pop()
+            cost -= c
+            base -= reduced
+    return best_cost, best_routes, nodes, True
+
+
+def _Greedy(problem, key):
+    """Places each circuit in turn on its first route by key that fits."""
+    counts = [[0] * (MAX_CONDUCTORS_PER_BUNDLE + 1) for _ in problem.max_bundles]
+    cost = 0.0
+    routes = []
+    for level, level_choices in enumerate(problem.choices):
+        size = problem.sizes[level]
+        for choice in sorted(level_choices, key=key):
+            _, c, r = choice
+            if _Fits(counts[r], problem.max_bundles[r], size):
+                counts[r][size] += 1
+                routes.append(r)
+                cost += c
+                break
+        else:
+            return math.inf, None
+    return cost, routes
+
+
+def _Prefixes(problem, best_cost, n_wanted):
+    """Choice prefixes that split the search tree into about n_wanted subtrees."""
+    limit = _Limit(best_cost)
+    prefixes = [((), problem.base_bound)]
+    depth = 0
+    while len(prefixes) < n_wanted and depth < len(problem.choices) - 1:
+        expanded = []
+        for prefix, base in prefixes:
+            first = prefix[-1] if depth and problem.same_as_previous[depth] else 0
+            for k in range(first, len(problem.choices[depth])):
+                reduced = problem.choices[depth][k][0]
+                if base + reduced + problem.suffix_bounds[depth + 1] < limit:
+                    expanded.append((prefix + (k,), base + reduced))
+        prefixes = expanded
+        depth += 1
+    # Promising subtrees first so that they are searched early.
+    prefixes.sort(key=lambda prefix_base: prefix_base[1])
+    return [prefix for prefix, _ in prefixes]
+
+
+def OptimizeBundles(circuits, routes, max_workers=None, max_nodes=1_000_000):
+    """Assigns circuits to routes and bundles minimizing copper volume.
+
+    Each circuit is sized on each of its candidate routes for both ampacity
+    (Table VI-B) and voltage drop (Tables IX and X, with the full circuit
+    length taken as twice the route length).  A branch and bound search
+    then places the circuits so that every route stays within its bundle
+    limit.  Subtrees are searched in parallel by max_workers processes
+    (os.cpu_count() if None).
+
+    Each parallel subtree search gets an equal share of max_nodes and
+    prunes against the best plan found before the searches started, not
+    the plans the others find.  When the search stops at max_nodes, more
+    workers can therefore return a somewhat worse plan than one; both
+    use the same copper whenever optimal is True.
+
+    """
+    circuits = list(circuits)
+    routes = list(routes)
+    route_indices = {route.name: i for i, route in enumerate(routes)}
+
+    # Copper volume in cm^3 of each circuit on each route.
+    costs = np.full((len(circuits), len(routes)), np.inf)
+    gauges = {}
+    for i, circuit in enumerate(circuits):
+        if not 1 <= circuit.n_conductors <= MAX_CONDUCTORS_PER_BUNDLE:
+            raise ValueError(
+                f"Circuit {circuit.name} has {circuit.n_conductors} conductors;"
+                f" at most {MAX_CONDUCTORS_PER_BUNDLE} fit in a bundle."
+            )
+        for route_name in circuit.routes or tuple(route_indices):
+            r = route_indices[route_name]
+            awg = _CircuitGauge(circuit, routes[r])
+            if awg is None:
+                continue
+            gauges[i, r] = awg
+            area_mm2 = wire.SolidWireCrossSectionalArea(awg).rescale(pq.mm**2)
+            length_m = routes[r].length.rescale(pq.m)
+            # mm^2 * m == cm^3
+            costs[i, r] = float(circuit.n_conductors * area_mm2 * length_m)
+        if not np.isfinite(costs[i]).any():
+            raise ValueError(f"No acceptable route for circuit {circuit.name}.")
+    sizes = np.array([circuit.n_conductors for circuit in circuits], dtype=float)
+    usage = _Usage(sizes)
+    capacities = _Capacities([route.max_bundles for route in routes])
+
+    # Branch on the circuits with the most to lose first, keeping
+    # interchangeable circuits together.
+    sorted_costs = np.sort(costs, axis=1)
+    regrets = (
+        sorted_costs[:, 1] - sorted_costs[:, 0]
+        if len(routes) > 1
+        else np.full(len(circuits), np.inf)
+    )
+    order = sorted(
+        range(len(circuits)),
+        key=lambda i: (-regrets[i], -sorted_costs[i, 0], tuple(costs[i]), sizes[i]),
+    )
+    same_as_previous = [False] + [
+        sizes[i] == sizes[j] and np.array_equal(costs[i], costs[j])
+        for i, j in zip(order[1:], order[:-1])
+    ]
+
+    def _MakeProblem(multipliers):
+        choices = []
+        for i in order:
+            choices.append(
+                sorted(
+                    (costs[i, r] + usage[i] @ multipliers[r], costs[i, r], r)
+                    for r in range(len(routes))
+                    if np.isfinite(costs[i, r])
+                )
+            )
+        suffix_bounds = [0.0] * (len(choices) + 1)
+        for level in reversed(range(len(choices))):
+            suffix_bounds[level] = suffix_bounds[level + 1] + choices[level][0][0]
+        return _Problem(
+            choices=choices,
+            sizes=[circuits[i].n_conductors for i in order],
+            max_bundles=[route.max_bundles for route in routes],
+            same_as_previous=same_as_previous,
+            suffix_bounds=suffix_bounds,
+            base_bound=-float((multipliers * capacities).sum()),
+        )
+
+    problem = _MakeProblem(np.zeros_like(capacities))
+    best_cost, best_routes = _Greedy(problem, key=lambda choice: choice[1])
+    lower_bound = problem.suffix_bounds[0]
+    nodes = 0
+    complete = True
+    # The greedy plan is optimal if it meets the lower bound.
+    if best_routes is None or _Limit(best_cost) > problem.suffix_bounds[0]:
+        multipliers = _Multipliers(costs, usage, capacities, best_cost)
+        problem = _MakeProblem(multipliers)
+        lower_bound = max(lower_bound, problem.base_bound + problem.suffix_bounds[0])
+        cost, greedy_routes = _Greedy(problem, key=lambda choice: choice[0])
+        if cost < best_cost:
+            best_cost, best_routes = cost, greedy_routes
+        if max_workers is None:
+            max_workers = os.cpu_count() or 1
+        prefixes = [()]
+        if max_workers > 1:
+            prefixes = _Prefixes(problem, best_cost, 4 * max_workers)
+        if len(prefixes) <= 1:
+            results = [
+                _BranchAndBound(problem, prefix, best_cost, max_nodes)
+                for prefix in prefixes
+            ]
+        else:
+            with concurrent.futures.ProcessPoolExecutor(max_workers) as executor:
+                futures = [
+                    executor.submit(
+                        _BranchAndBound,
+                        problem,
+                        prefix,
+                        best_cost,
+                        max(1, max_nodes // len(prefixes)),
+                    )
+                    for prefix in prefixes
+                ]
+                results = [future.result() for future in futures]
+        for cost, subtree_routes, subtree_nodes, subtree_complete in results:
+            nodes += subtree_nodes
+            complete = complete and subtree_complete
+            if subtree_routes is not None and cost < best_cost:
+                best_cost, best_routes = cost, subtree_routes
+    if best_routes is None:
+        if not complete:
+            raise ValueError(f"No assignment of circuits found in {nodes} nodes.")
+        raise ValueError("No assignment of circuits fits within the routes.")
+
+    route_of = dict(zip(order, best_routes))
+    assignments = [None] * len(circuits)
+    for r, route in enumerate(routes):
+        members = [i for i in range(len(circuits)) if route_of[i] == r]
+        bundles = _PackBundles([circuits[i].n_conductors for i in members])
+        for i, bundle in zip(members, bundles):
+            assignments[i] = BundleAssignment(
+                circuit=circuits[i].name,
+                route=route.name,
+                bundle=bundle,
+                awg=wire.CanonicalizeAWG(gauges[i, r]),
+            )
+    return BundlePlan(
+        assignments=tuple(assignments),
+        copper_volume=best_cost * pq.cm**3,
+        lower_bound=(best_cost if complete else lower_bound) * pq.cm**3,
+        optimal=complete,
+        nodes=nodes,
+    )
@@ -0,0 +1,143 @@
+#
+# Copyright (c) 2023, Christopher Hoover
+#
+# SPDX-License-Identifier: BSD-3-Clause
+#
+
+"""Bundle test."""
+
+# pylint: disable=missing-function-docstring
+# pylint: disable=invalid-name
+
+import itertools
+import random
+
+import pytest
+import quantities as pq
+
+from . import abyc, bundle, wire
+from .test_utils import isclose
+
+
+def _Routes(port_bundles, stbd_bundles, keel_bundles):
+    return [
+        bundle.Route("port", 20.0 * pq.ft, port_bundles, 105 * pq.C),
+        bundle.Route("stbd", 30.0 * pq.ft, stbd_bundles, 105 * pq.C),
+        bundle.Route("keel", 45.0 * pq.ft, keel_bundles, 105 * pq.C),
+    ]
+
+
+def _ExhaustiveCopperVolume(circuits, routes):
+    volumes = {}
+    for (i, c), (r, route) in itertools.product(enumerate(circuits), enumerate(routes)):
+        awg = min(
+            wire.AWGSpecificationToNumber(
+                abyc.GetWireGaugeForDCDrop(c.voltage, c.current, 2.0 * route.length)
+            ),
+            wire.AWGSpecificationToNumber(
+                abyc.GetWireGaugeUpToThreeConductorBundle(
+                    c.current, route.insulation_temp_rating
+                )
+            ),
+        )
+        volumes[i, r] = float(
+            (
+                c.n_conductors * wire.SolidWireCrossSectionalArea(awg) * route.length
+            ).rescale(pq.cm**3)
+        )
+    best = None
+    for combo in itertools.product(range(len(routes)), repeat=len(circuits)):
+        for r, route in enumerate(routes):
+            sizes = [c.n_conductors for c, i in zip(circuits, combo) if i == r]
+            n1, n2, n3 = (sizes.count(n) for n in (1, 2, 3))
+            if bundle.BundlesNeeded(n1, n2, n3) > route.max_bundles:
+                break
+        else:
+            volume = sum(volumes[i, r] for i, r in enumerate(combo))
+            if best is None or volume < best:
+                best = volume
+    return best * pq.cm**3
+
+
+def testBundlesNeeded():
+    assert bundle.BundlesNeeded(0, 0, 0) == 0
+    assert bundle.BundlesNeeded(3, 0, 0) == 1
+    assert bundle.BundlesNeeded(4, 0, 0) == 2
+    assert bundle.BundlesNeeded(0, 2, 0) == 2
+    assert bundle.BundlesNeeded(2, 2, 0) == 2
+    assert bundle.BundlesNeeded(3, 2, 1) == 4
+
+
+def testOptimizeBundlesShortestRoute():
+    circuits = [
+        bundle.Circuit(f"c{i}", 12.0 * pq.V, 10.0 * pq.A, n_conductors=2)
+        for i in range(3)
+    ]
+    plan = bundle.OptimizeBundles(circuits, _Routes(3, 3, 3), max_workers=1)
+    assert plan.optimal
+    assert [a.route for a in plan.assignments] == ["port"] * 3
+    assert [a.bundle for a in plan.assignments] == [0, 1, 2]
+    assert [a.awg for a in plan.assignments] == [8] * 3
+    assert isclose(plan.copper_volume, plan.lower_bound, atol=1e-6 * pq.cm**3)
+
+
+def testOptimizeBundlesSharedBundle():
+    circuits = [
+        bundle.Circuit("windlass", 12.0 * pq.V, 40.0 * pq.A, n_conductors=2),
+        bundle.Circuit("light", 12.0 * pq.V, 3.0 * pq.A, n_conductors=1),
+        bundle.Circuit("horn", 12.0 * pq.V, 8.0 * pq.A, n_conductors=2),
+    ]
+    plan = bundle.OptimizeBundles(circuits, _Routes(1, 3, 3), max_workers=1)
+    assert plan.optimal
+    # The windlass gains most from the short route and the light fits
+    # beside it.
+    assert [(a.route, a.bundle) for a in plan.assignments] == [
+        ("port", 0),
+        ("port", 0),
+        ("stbd", 0),
+    ]
+
+
+def testOptimizeBundlesRestrictedRoutes():
+    circuits = [
+        bundle.Circuit("bilge", 12.0 * pq.V, 5.0 * pq.A, routes=("keel",)),
+    ]
+    plan = bundle.OptimizeBundles(circuits, _Routes(3, 3, 3), max_workers=1)
+    assert plan.assignments[0].route == "keel"
+
+
+@pytest.mark.parametrize("max_workers", [1, 2])
+def testOptimizeBundlesMatchesExhaustiveSearch(max_workers):
+    rng = random.Random(1)
+    circuits = [
+        bundle.Circuit(
+            f"c{i}",
+            12.0 * pq.V,
+            rng.choice([3.0, 8.0, 15.0, 25.0, 40.0]) * pq.A,
+            n_conductors=rng.choice([1, 2, 2, 3]),
+        )
+        for i in range(7)
+    ]
+    routes = _Routes(2, 2, 3)
+    plan = bundle.OptimizeBundles(circuits, routes, max_workers=max_workers)
+    assert plan.optimal
+    assert isclose(
+        plan.copper_volume,
+        _ExhaustiveCopperVolume(circuits, routes),
+        atol=1e-6 * pq.cm**3,
+    )
+
+
+def testOptimizeBundlesNoAcceptableGauge():
+    circuits = [bundle.Circuit("thruster", 12.0 * pq.V, 400.0 * pq.A)]
+    with pytest.raises(ValueError):
+        bundle.OptimizeBundles(circuits, _Routes(3, 3, 3), max_workers=1)
+
+
+def testOptimizeBundlesTooManyCircuits():
+    circuits = [
+        bundle.Circuit(f"c{i}", 12.0 * pq.V, 5.0 * pq.A, n_conductors=3)
+        for i in range(4)
+    ]
+    with pytest.raises(ValueError):
+        bundle.OptimizeBundles(circuits, _Routes(1, 1, 1), max_workers=1)
@@ -0,0 +1,216 @@
+#
+# Copyright (c) 2023, Christopher Hoover
+#
+# SPDX-License-Identifier: BSD-3-Clause
+#
+
+"""Command line interface.
+
+Only argparse is imported up front; each subcommand imports the modules
+it needs when it runs, so that --help and simple queries start quickly.
+
+"""
+
+# pylint: disable=import-outside-toplevel
+
+import argparse
+import re
+import shlex
+import sys
+
+_QUANTITY_RE = re.compile(
+    r"^\s*([-+]?(?:\d+\.?\d*|\.\d+)(?:[eE][-+]?\d+)?)\s*(\S*)\s*$"
+)
+
+CHEMISTRIES = {
+    "nmc": "LithiumNMC",
+    "lfp": "LithiumFePO4",
+    "lead-acid": "LeadAcid",
+}
+
+
+def _Quantity(text, default_units):
+    """Parses "50", "50ft" or "15 m" into a quantity."""
+    import quantities as pq
+
+    match = _QUANTITY_RE.match(text)
+    if not match:
+        raise ValueError(f"{text!r} is not a quantity.")
+    value, units = match.groups()
+    try:
+        return pq.Quantity(float(value), units or default_units)
+    except (LookupError, SyntaxError):
+        raise ValueError(f"{text!r} has unknown units.") from None
+
+
+def _Format(quantity, units=None):
+    if units is not None:
+        quantity = quantity.rescale(units)
+    return f"{float(quantity.magnitude):.6g} {quantity.dimensionality.string}"
+
+
+def _WireProperties(args):
+    from . import wire
+
+    lines = []
+    for awg in args.awg:
+        fields = [
+            str(wire.CanonicalizeAWG(awg)),
+            _Format(wire.SolidWireDiameter(awg), "mm"),
+            _Format(wire.SolidWireCrossSectionalArea(awg), "mm**2"),
+            _Format(wire.SolidWireResistancePerUnitLength(awg), "ohm/m"),
+        ]
+        if args.metric:
+            from . import conductor
+
+            fields.append(_Format(conductor.NearestMetricSize(awg), "mm**2"))
+        lines.append("\t".join(fields))
+    return lines
+
+
+def _WireSize(args):
+    from . import abyc
+
+    awg = abyc.GetWireGaugeForDCCircuit(
+        _Quantity(args.voltage, "V"),
+        _Quantity(args.current, "A"),
+        _Quantity(args.length, "ft"),
+        _Quantity(args.insulation_temp, "C"),
+        drop_pc=args.drop_pc,
+        engine_room=args.engine_room,
+        metric=args.metric,
+        material=args.material,
+    )
+    return [_Format(awg, "mm**2") if args.metric else str(awg)]
+
+
+def _Battery(args):
+    from . import battery
+
+    chemistry = getattr(battery, CHEMISTRIES[args.chemistry])
+    series_battery = battery.SeriesBattery(
+        cell_chemistry=chemistry,
+        total_energy=_Quantity(args.energy, "W*h"),
+        n_cells=args.cells,
+    )
+    return [
+        f"nominal_voltage\t{_Format(series_battery.nominal_voltage, 'V')}",
+        f"capacity\t{_Format(series_battery.capacity, 'A*h')}",
+        f"mass\t{_Format(series_battery.mass, 'kg')}",
+        f"volume\t{_Format(series_battery.volume, 'L')}",
+    ]
+
+
+def _Wearable(args):
+    import quantities as pq
+
+    from . import wearable
+
+    flux = wearable.TouchSurfacePassiveFlux(_Quantity(args.ambient_temp, "C"))
+    lines = [f"flux\t{_Format(flux, pq.mW / pq.mm**2)}"]
+    if args.power is not None:
+        area = _Quantity(args.power, "mW") / flux
+        lines.append(f"min_area\t{_Format(area, pq.mm**2)}")
+    return lines
+
+
+def _Parser():
+    parser = argparse.ArgumentParser(
+        prog="engmath",
+        description="Engineering math helpers.",
+        epilog="Quantities take an optional unit suffix, as in 50ft or 15m.",
+    )
+    commands = parser.add_subparsers(dest="command", required=True)
+
+    wire_parser = commands.add_parser("wire", help="wire properties and sizing")
+    wire_commands = wire_parser.add_subparsers(dest="wire_command", required=True)
+    properties = wire_commands.add_parser(
+        "properties",
+        help="diameter, area and copper resistance of solid wire by AWG",
+    )
+    properties.add_argument("awg", nargs="+", help="AWG, e.g. 12 or 2/0")
+    properties.add_argument(
+        "--metric", action="store_true", help="also print the nearest metric size"
+    )
+    properties.set_defaults(handler=_WireProperties)
+    size = wire_commands.add_parser(
+        "size", help="ABYC E-11 gauge for a DC circuit (drop and ampacity)"
+    )
+    size.add_argument("--voltage", required=True, help="system voltage (V)")
+    size.add_argument("--current", required=True, help="circuit current (A)")
+    size.add_argument("--length", required=True, help="source to device and back (ft)")
+    size.add_argument("--insulation-temp", required=True, help="insulation rating (C)")
+    size.add_argument("--drop-pc", type=int, default=3, choices=(3, 10))
+    size.add_argument("--engine-room", action="store_true")
+    size.add_argument(
+        "--material", default="copper", help="conductor material, e.g. aluminum"
+    )
+    size.add_argument("--metric", action="store_true", help="answer with a metric size")
+    size.set_defaults(handler=_WireSize)
+
+    battery_parser = commands.add_parser(
+        "battery", help="nominal properties of a series battery"
+    )
+    battery_parser.add_argument("--chemistry", required=True, choices=CHEMISTRIES)
+    battery_parser.add_argument("--energy", required=True, help="total energy (Wh)")
+    battery_parser.add_argument("--cells", type=int, default=1)
+    battery_parser.set_defaults(handler=_Battery)
+
+    wearable_parser = commands.add_parser(
+        "wearable", help="passive cooling of a touch surface"
+    )
+    wearable_parser.add_argument(
+        "--ambient-temp", required=True, help="ambient temperature (C)"
+    )
+    wearable_parser.add_argument(
+        "--power", help="dissipated power (mW); prints the minimum area"
+    )
+    wearable_parser.set_defaults(handler=_Wearable)
+
+    batch_parser = commands.add_parser(
+        "batch",
+        help="run one query per line of stdin, e.g. 'wire properties 12'",
+    )
+    batch_parser.set_defaults(handler=None)
+    return parser
+
+
+def _Batch(parser, stdin, stdout):
+    """Runs each line of stdin as a query; errors do not stop the batch."""
+    status = 0
+    for line in stdin:
+        argv = shlex.split(line, comments=True)
+        if not argv:
+            continue
+        try:
+            # argparse would print help to sys.stdout and exit.
+            if {"-h", "--help"} & set(argv):
+                raise ValueError("help is not available in batch queries.")
+            args = parser.parse_args(argv)
+            if args.handler is None:
+                raise ValueError("batch queries cannot nest.")
+            lines = args.handler(args)
+        except SystemExit:
+            lines = [f"error: {line.strip()}"]
+            status = 1
+        except (KeyError, ValueError) as error:
+            lines = [f"error: {error}"]
+            status = 1
+        stdout.write("".join(f"{output}\n" for output in lines))
+    return status
+
+
+def main(argv=None, stdin=None, stdout=None):
+    """Runs the engmath command line; returns the exit status."""
+    stdin = sys.stdin if stdin is None else stdin
+    stdout = sys.stdout if stdout is None else stdout
+    parser = _Parser()
+    args = parser.parse_args(argv)
+    if args.handler is None:
+        return _Batch(parser, stdin, stdout)
+    try:
+        lines = args.handler(args)
+    except (KeyError, ValueError) as error:
+        parser.exit(1, f"engmath: error: {error}\n")
+    stdout.write("".join(f"{output}\n" for output in lines))
+    return 0
@@ -0,0 +1,137 @@
+#
+# Copyright (c) 2023, Christopher Hoover
+#
+# SPDX-License-Identifier: BSD-3-Clause
+#
+
+"""CLI test."""
+
+# pylint: disable=missing-function-docstring
+# pylint: disable=invalid-name
+
+import io
+import pathlib
+import subprocess
+import sys
+
+import pytest
+
+from . import cli
+
+
+def _Run(*argv, stdin=""):
+    stdout = io.StringIO()
+    status = cli.main(list(argv), stdin=io.StringIO(stdin), stdout=stdout)
+    return status, stdout.getvalue().splitlines()
+
+
+def testWireProperties():
+    status, lines = _Run("wire", "properties", "12", "4/0", "--metric")
+    assert status == 0
+    assert lines == [
+        "12\t2.05253 mm\t3.30877 mm**2\t0.00521039 ohm/m\t4 mm**2",
+        "4/0\t11.684 mm\t107.219 mm**2\t0.000160792 ohm/m\t120 mm**2",
+    ]
+
+
+def testWireSize():
+    argv = ["wire", "size", "--voltage", "12", "--current", "90"]
+    argv += ["--length", "60ft", "--insulation-temp", "60"]
+    assert _Run(*argv) == (0, ["4/0"])
+    argv = ["wire", "size", "--voltage", "12", "--current", "15"]
+    argv += ["--length", "15m", "--insulation-temp", "60", "--metric"]
+    assert _Run(*argv) == (0, ["16 mm**2"])
+    argv = ["wire", "size", "--voltage", "12", "--current", "20", "--length", "30ft"]
+    argv += ["--insulation-temp", "105", "--material", "aluminum"]
+    assert _Run(*argv) == (0, ["4"])
+
+
+def testBattery():
+    argv = ["battery", "--chemistry", "lfp", "--energy", "1.28kWh", "--cells", "4"]
+    status, lines = _Run(*argv)
+    assert status == 0
+    assert lines[:2] == ["nominal_voltage\t12.8 V", "capacity\t100 h*A"]
+
+
+def testWearable():
+    status, lines = _Run("wearable", "--ambient-temp", "25", "--power", "100")
+    assert status == 0
+    assert lines == ["flux\t0.216 mW/mm**2", "min_area\t462.963 mm**2"]
+
+
+def testError():
+    with pytest.raises(SystemExit) as exc_info:
+        _Run("wire", "properties", "2/3")
+    assert exc_info.value.code == 1
+
+
+def testBatch():
+    stdin = (
+        "wire properties 10\n"
+        "# A comment.\n"
+        "\n"
+        "wire size --voltage 13 --current 5 --length 10 --insulation-temp 60\n"
+        "bogus\n"
+        "wearable --ambient-temp 25\n"
+    )
+    status, lines = _Run("batch", stdin=stdin)
+    assert status == 1
+    assert len(lines) == 4
+    assert lines[0].startswith("10\t")
+    assert lines[1].startswith("error: Voltage is not one of")
+    assert lines[2] == "error: bogus"
+    assert lines[3] == "flux\t0.216 mW/mm**2"
+
+
+def testStartupImports():
+    package_dir = pathlib.Path(__file__).resolve().parent
+    code = (
+        f"import sys; from {package_dir.name} import cli\n"
+        "try:\n"
+        "    cli.main(['--help'])\n"
+        "except SystemExit:\n"
+        "    pass\n"
+        "assert 'numpy' not in sys.modules\n"
+        "cli.main(['wire', 'properties', '12'])\n"
+        "assert 'pandas' not in sys.modules\n"
+    )
+    subprocess.run(
+        [sys.executable, "-c", code],
+        cwd=package_dir.parent,
+        check=True,
+        capture_output=True,
+    )
+
+
+def testModuleMain():
+    package_dir = pathlib.Path(__file__).resolve().parent
+    result = subprocess.run(
+        [sys.executable, "-m", package_dir.name, "wire", "properties", "12"],
+        cwd=package_dir.parent,
+        check=True,
+        capture_output=True,
+        text=True,
+    )
+    assert result.stdout.startswith("12\t2.05253 mm")
+
+
+def testBatchBadUnitsAndHelp(capsys):
+    stdin = (
+        "wire size --voltage 12 --current 10 --length 10xyz --insulation-temp 105\n"
+        "wire properties --help\n"
+        "wire properties 12\n"
+    )
+    status, lines = _Run("batch", stdin=stdin)
+    assert status == 1
+    assert lines[0] == "error: '10xyz' has unknown units."
+    assert lines[1] == "error: help is not available in batch queries."
+    assert lines[2].startswith("12\t")
+    assert capsys.readouterr().out == ""
+
+
+def testBadUnits():
+    argv = ["wire", "size", "--voltage", "12", "--current", "10"]
+    argv += ["--length", "10xyz", "--insulation-temp", "105"]
+    with pytest.raises(SystemExit) as exc_info:
+        _Run(*argv)
+    assert exc_info.value.code == 1
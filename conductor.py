@@ -0,0 +1,233 @@
+#
+# Copyright (c) 2023, Christopher Hoover
+#
+# SPDX-License-Identifier: BSD-3-Clause
+#
+
+"""Catalog of AWG and metric conductor sizes."""
+
+import dataclasses
+import functools
+
+import numpy as np
+import quantities as pq
+
+from . import resistivity, wire
+
+# AWG 4/0 through 40 as AWG numbers (see wire.AWGSpecificationToNumber()).
+AWG_NUMBERS = tuple(range(-3, 40 + 1))
+
+# IEC 60228 nominal cross sections, with the small ISO 6722 automotive sizes.
+METRIC_SIZES_MM2 = (
+    0.13,
+    0.22,
+    0.35,
+    0.5,
+    0.75,
+    1.0,
+    1.5,
+    2.5,
+    4.0,
+    6.0,
+    10.0,
+    16.0,
+    25.0,
+    35.0,
+    50.0,
+    70.0,
+    95.0,
+    120.0,
+    150.0,
+    185.0,
+    240.0,
+    300.0,
+)
+
+
+@dataclasses.dataclass(frozen=True)
+class ConductorCatalog:
+    """Areas and resistances of the AWG and metric sizes.
+
+    Each array is ordered by increasing area, so the AWG numbers decrease.
+    Every material in resistivity.MATERIALS has a row of resistances, at
+    the reference temperature, in the *_resistance_ohm_per_m arrays in the
+    order of materials.
+
+    """
+
+    awg: np.ndarray
+    awg_area_mm2: np.ndarray
+    metric_area_mm2: np.ndarray
+    materials: tuple
+    awg_resistance_ohm_per_m: np.ndarray
+    metric_resistance_ohm_per_m: np.ndarray
+
+    def __post_init__(self):
+        for field in dataclasses.fields(self):
+            value = getattr(self, field.name)
+            if isinstance(value, np.ndarray):
+                value.flags.writeable = False
+
+
+def _OhmSquareMillimetersPerMeter(resistivity_):
+    return float(resistivity_.rescale(pq.ohm * pq.mm**2 / pq.m))
+
+
+@functools.cache
+def Catalog():
+    """Returns the conductor catalog, computing it on first use."""
+    awg = np.array(sorted(AWG_NUMBERS, reverse=True))
+    awg_area_mm2 = np.array(
+        [float(wire.SolidWireCrossSectionalArea(n).rescale(pq.mm**2)) for n in awg]
+    )
+    metric_area_mm2 = np.array(METRIC_SIZES_MM2)
+    p_ohm_mm2_per_m = np.array(
+        [
+            _OhmSquareMillimetersPerMeter(material.resistivity)
+            for material in resistivity.MATERIALS.values()
+        ]
+    )[:, np.newaxis]
+    return ConductorCatalog(
+        awg=awg,
+        awg_area_mm2=awg_area_mm2,
+        metric_area_mm2=metric_area_mm2,
+        materials=tuple(resistivity.MATERIALS),
+        awg_resistance_ohm_per_m=p_ohm_mm2_per_m / awg_area_mm2,
+        metric_resistance_ohm_per_m=p_ohm_mm2_per_m / metric_area_mm2,
+    )
+
+
+def _Resistances(material, resistances_ohm_per_m, areas_mm2):
+    """The resistances in ohm/m of the material across one kind of size.
+
+    Materials in resistivity.MATERIALS have their row of
+    resistances_ohm_per_m; others are computed from areas_mm2.
+
+    """
+    if resistivity.MATERIALS.get(material.name) is material:
+        return resistances_ohm_per_m[Catalog().materials.index(material.name)]
+    return _OhmSquareMillimetersPerMeter(material.resistivity) / areas_mm2
+
+
+def _TemperatureFactor(material, temperature):
+    if temperature is None:
+        return 1.0
+    return np.asarray(
+        material.ResistivityAt(temperature) / material.resistivity, dtype=float
+    )
+
+
+def AWGNumbers(awg):
+    """Converts an AWG specification or array of them to AWG numbers."""
+    awg = np.asarray(awg)
+    if awg.dtype.kind in "iu":
+        return awg
+    numbers = [wire.AWGSpecificationToNumber(a) for a in awg.ravel().tolist()]
+    return np.array(numbers, dtype=int).reshape(awg.shape)
+
+
+def _AWGIndex(awg):
+    numbers = AWGNumbers(awg)
+    if np.any((numbers < AWG_NUMBERS[0]) | (numbers > AWG_NUMBERS[-1])):
+        raise ValueError("AWG outside of 4/0 to 40.")
+    # The catalog runs from AWG 40 up to AWG 4/0.
+    return AWG_NUMBERS[-1] - numbers
+
+
+def _Nearest(sorted_areas_mm2, areas_mm2):
+    """Indices of the sorted areas nearest to areas_mm2 in ratio."""
+    log_sorted = np.log(sorted_areas_mm2)
+    log_areas = np.log(areas_mm2)
+    upper = np.clip(np.searchsorted(log_sorted, log_areas), 1, len(log_sorted) - 1)
+    lower = upper - 1
+    use_upper = log_sorted[upper] - log_areas < log_areas - log_sorted[lower]
+    return np.where(use_upper, upper, lower)
+
+
+def _NextLarger(sorted_areas_mm2, areas_mm2, what):
+    """Indices of the smallest sorted areas at least areas_mm2."""
+    indices = np.searchsorted(sorted_areas_mm2, areas_mm2)
+    if np.any(indices >= len(sorted_areas_mm2)):
+        raise ValueError(f"No {what} size is large enough.")
+    return indices
+
+
+def _Area_mm2(area):
+    return np.asarray(area.rescale(pq.mm**2).magnitude, dtype=float)
+
+
+def _MetricIndex(area):
+    catalog = Catalog()
+    areas_mm2 = _Area_mm2(area)
+    indices = _Nearest(catalog.metric_area_mm2, areas_mm2)
+    if not np.allclose(catalog.metric_area_mm2[indices], areas_mm2, rtol=1e-9, atol=0):
+        raise ValueError("Not a metric size; see METRIC_SIZES_MM2.")
+    return indices
+
+
+def AWGArea(awg):
+    """The cross-sectional area of the AWG size(s)."""
+    return pq.Quantity(Catalog().awg_area_mm2[_AWGIndex(awg)], pq.mm**2)
+
+
+def AWGResistancePerUnitLength(awg, material="copper", temperature=None):
+    """The resistance per unit length of the AWG size(s) of the material.
+
+    material is a resistivity.Material or the name of one.  The resistance
+    is at the reference temperature unless temperature is given.
+
+    """
+    material = resistivity.GetMaterial(material)
+    catalog = Catalog()
+    r_ohm_per_m = _Resistances(
+        material, catalog.awg_resistance_ohm_per_m, catalog.awg_area_mm2
+    )[_AWGIndex(awg)]
+    return pq.Quantity(
+        r_ohm_per_m * _TemperatureFactor(material, temperature), pq.ohm / pq.m
+    )
+
+
+def MetricResistancePerUnitLength(area, material="copper", temperature=None):
+    """The resistance per unit length of the metric size(s) of the
+    material.  area must be one of METRIC_SIZES_MM2.
+
+    """
+    material = resistivity.GetMaterial(material)
+    catalog = Catalog()
+    r_ohm_per_m = _Resistances(
+        material, catalog.metric_resistance_ohm_per_m, catalog.metric_area_mm2
+    )[_MetricIndex(area)]
+    return pq.Quantity(
+        r_ohm_per_m * _TemperatureFactor(material, temperature), pq.ohm / pq.m
+    )
+
+
+def NearestMetricSize(awg):
+    """The metric size(s) closest in area to the AWG size(s)."""
+    catalog = Catalog()
+    awg_area_mm2 = catalog.awg_area_mm2[_AWGIndex(awg)]
+    indices = _Nearest(catalog.metric_area_mm2, awg_area_mm2)
+    return pq.Quantity(catalog.metric_area_mm2[indices], pq.mm**2)
+
+
+def NextLargerMetricSize(awg):
+    """The smallest metric size(s) with at least the area of the AWG size(s)."""
+    catalog = Catalog()
+    awg_area_mm2 = catalog.awg_area_mm2[_AWGIndex(awg)]
+    indices = _NextLarger(catalog.metric_area_mm2, awg_area_mm2, "metric")
+    return pq.Quantity(catalog.metric_area_mm2[indices], pq.mm**2)
+
+
+def NearestAWG(area):
+    """The AWG number(s) closest in area to the given area(s)."""
+    catalog = Catalog()
+    return catalog.awg[_Nearest(catalog.awg_area_mm2, _Area_mm2(area))]
+
+
+def NextLargerAWG(area):
+    """The AWG number(s) of the smallest AWG size(s) with at least the given
+    area(s).
+
+    """
+    catalog = Catalog()
+    return catalog.awg[_NextLarger(catalog.awg_area_mm2, _Area_mm2(area), "AWG")]
@@ -0,0 +1,157 @@
+#
+# Copyright (c) 2023, Christopher Hoover
+#
+# SPDX-License-Identifier: BSD-3-Clause
+#
+
+"""Conductor test."""
+
+# pylint: disable=missing-function-docstring
+# pylint: disable=invalid-name
+
+import numpy as np
+import pytest
+import quantities as pq
+
+from . import conductor, resistivity, wire
+from .test_utils import isclose
+
+
+def testCatalogMatchesWire():
+    catalog = conductor.Catalog()
+    assert len(catalog.awg) == 44
+    copper = catalog.materials.index("copper")
+    for awg, area_mm2, r_ohm_per_m in zip(
+        catalog.awg, catalog.awg_area_mm2, catalog.awg_resistance_ohm_per_m[copper]
+    ):
+        assert isclose(
+            wire.SolidWireCrossSectionalArea(awg),
+            area_mm2 * pq.mm**2,
+            atol=1e-9 * pq.mm**2,
+        )
+        assert isclose(
+            wire.SolidWireResistancePerUnitLength(awg),
+            r_ohm_per_m * pq.ohm / pq.m,
+            atol=1e-12 * pq.ohm / pq.m,
+        )
+    assert np.all(np.diff(catalog.awg_area_mm2) > 0.0)
+    assert np.all(np.diff(catalog.metric_area_mm2) > 0.0)
+
+
+def testCatalogIsReadOnly():
+    with pytest.raises(ValueError):
+        conductor.Catalog().metric_area_mm2[0] = 1.0
+
+
+def testAWGArea():
+    assert isclose(conductor.AWGArea("4/0"), 107.2 * pq.mm**2, atol=0.1 * pq.mm**2)
+    areas = conductor.AWGArea([10, "2/0"])
+    assert np.allclose(areas.rescale(pq.mm**2).magnitude, [5.26, 67.43], atol=0.01)
+
+
+def testAWGResistancePerUnitLength():
+    assert isclose(
+        conductor.AWGResistancePerUnitLength(40),
+        3.441 * pq.ohm / pq.m,
+        atol=100e-6 * pq.ohm / pq.m,
+    )
+
+
+def testMaterialResistancePerUnitLength():
+    for material in resistivity.MATERIALS.values():
+        for awg in (40, 10, "4/0"):
+            assert isclose(
+                conductor.AWGResistancePerUnitLength(awg, material.name),
+                wire.SolidWireResistancePerUnitLength(awg, p=material.resistivity),
+                atol=1e-12 * pq.ohm / pq.m,
+            )
+    r_Cu = conductor.AWGResistancePerUnitLength([10, 12])
+    r_Al = conductor.AWGResistancePerUnitLength([10, 12], resistivity.Aluminum)
+    assert np.allclose(r_Al.magnitude / r_Cu.magnitude, 26.5 / 17.24)
+
+
+def testMaterialResistanceAtTemperature():
+    r_20C = conductor.AWGResistancePerUnitLength(10)
+    r = conductor.AWGResistancePerUnitLength(10, temperature=[20.0, 70.0] * pq.C)
+    assert np.allclose(r.magnitude, float(r_20C) * np.array([1.0, 1.1965]))
+    r = conductor.MetricResistancePerUnitLength(
+        1.5 * pq.mm**2, "aluminum", temperature=-30.0 * pq.C
+    )
+    assert isclose(r, 17.667e-3 * pq.ohm / pq.m * 0.7985, atol=1e-6 * pq.ohm / pq.m)
+
+
+def testCustomMaterial():
+    brass = resistivity.Material(
+        name="brass", resistivity=70e-9 * pq.ohm * pq.m, alpha=0.0015
+    )
+    assert isclose(
+        conductor.AWGResistancePerUnitLength(10, brass),
+        wire.SolidWireResistancePerUnitLength(10, p=brass.resistivity),
+        atol=1e-12 * pq.ohm / pq.m,
+    )
+
+
+def testUnknownMaterial():
+    with pytest.raises(KeyError):
+        conductor.AWGResistancePerUnitLength(10, "unobtainium")
+
+
+def testMetricResistancePerUnitLength():
+    assert isclose(
+        conductor.MetricResistancePerUnitLength(1.5 * pq.mm**2),
+        11.49e-3 * pq.ohm / pq.m,
+        atol=0.01e-3 * pq.ohm / pq.m,
+    )
+
+
+def testMetricResistanceTable():
+    areas = [0.13, 1.5, 300.0] * pq.mm**2
+    for material in resistivity.MATERIALS.values():
+        assert np.allclose(
+            conductor.MetricResistancePerUnitLength(areas, material).magnitude,
+            (material.resistivity / areas).rescale(pq.ohm / pq.m).magnitude,
+        )
+    assert isclose(
+        conductor.MetricResistancePerUnitLength(1500.0 * pq.um * pq.mm),
+        conductor.MetricResistancePerUnitLength(1.5 * pq.mm**2),
+        atol=1e-12 * pq.ohm / pq.m,
+    )
+
+
+def testMetricResistanceNotAMetricSize():
+    with pytest.raises(ValueError):
+        conductor.MetricResistancePerUnitLength(2.0 * pq.mm**2)
+
+
+def testAWGOutOfRange():
+    with pytest.raises(ValueError):
+        conductor.AWGArea(41)
+
+
+def testNearestMetricSize():
+    sizes = conductor.NearestMetricSize([18, 14, 12, 10, 8, 6, 4, 2, "2/0", "4/0"])
+    expected = [0.75, 2.5, 4.0, 6.0, 10.0, 16.0, 25.0, 35.0, 70.0, 120.0]
+    assert np.allclose(sizes.rescale(pq.mm**2).magnitude, expected)
+
+
+def testNextLargerMetricSize():
+    # AWG 16 is 1.31 mm^2 and AWG 4 is 21.2 mm^2.
+    sizes = conductor.NextLargerMetricSize(np.array([16, 4]))
+    assert np.allclose(sizes.rescale(pq.mm**2).magnitude, [1.5, 25.0])
+    assert conductor.NextLargerMetricSize("1/0").shape == ()
+
+
+def testNearestAWG():
+    awgs = conductor.NearestAWG([0.5, 1.5, 2.5, 6.0, 50.0] * pq.mm**2)
+    assert list(awgs) == [20, 15, 13, 9, 0]
+
+
+def testNextLargerAWG():
+    awgs = conductor.NextLargerAWG([0.5, 1.5, 2.5, 6.0, 50.0] * pq.mm**2)
+    assert list(awgs) == [20, 15, 13, 9, 0]
+    assert conductor.NextLargerAWG(2.08 * pq.mm**2) == 14
+
+
+def testNextLargerAWGTooLarge():
+    with pytest.raises(ValueError):
+        conductor.NextLargerAWG(120.0 * pq.mm**2)
@@ -0,0 +1,148 @@
+#
+# Copyright (c) 2023, Christopher Hoover
+#
+# SPDX-License-Identifier: BSD-3-Clause
+#
+
+"""Streaming coulomb counting for battery packs."""
+
+import numpy as np
+import quantities as pq
+
+_As = pq.A * pq.s
+
+
+def _Magnitude(value, units):
+    return np.asarray(value.rescale(units).magnitude, dtype=float)
+
+
+class CoulombCounter:
+    """Running state of charge and energy use for an array of packs.
+
+    Telemetry is fed to Update() in chunks of samples, with current
+    positive when discharging.  Each sample is held for its interval dt.
+    Average current and power are exponentially weighted with time constant
+    tau, and corrected for the averages starting from zero, so they are
+    the plain averages while less than tau has elapsed.  The state kept per pack is a handful of floats however long the
+    stream, and a chunk costs time proportional to its length.
+
+    """
+
+    def __init__(self, batteries, initial_state_of_charge=1.0, tau=60.0 * pq.s):
+        batteries = list(batteries)
+        self._capacity_As = np.array(
+            [float(b.capacity.rescale(_As)) for b in batteries]
+        )
+        self._total_energy_J = np.array(
+            [float(b.total_energy.rescale(pq.J)) for b in batteries]
+        )
+        self._tau_s = float(tau.rescale(pq.s))
+        self._charge_As = self._capacity_As * np.broadcast_to(
+            np.asarray(initial_state_of_charge, dtype=float), self._capacity_As.shape
+        )
+        self._charge_used_As = np.zeros_like(self._capacity_As)
+        self._energy_used_J = np.zeros_like(self._capacity_As)
+        self._average_current_A = np.zeros_like(self._capacity_As)
+        self._average_power_W = np.zeros_like(self._capacity_As)
+        self._elapsed_s = np.zeros_like(self._capacity_As)
+
+    @property
+    def n_packs(self):
+        "Returns the number of packs tracked."
+        return len(self._capacity_As)
+
+    def Update(self, current, voltage, dt):
+        """Accumulates samples of pack current and voltage.
+
+        current and voltage have shape (n_samples, n_packs), or (n_packs,)
+        for a single sample.  dt is a scalar, or has shape (n_samples,) or
+        (n_samples, n_packs).
+
+        """
+        current_A = np.atleast_2d(_Magnitude(current, pq.A))
+        voltage_V = np.broadcast_to(_Magnitude(voltage, pq.V), current_A.shape)
+        dt_s = _Magnitude(dt, pq.s)
+        if dt_s.ndim == 1:
+            dt_s = dt_s[:, np.newaxis]
+        dt_s = np.broadcast_to(dt_s, current_A.shape)
+        if current_A.shape[0] == 0:
+            return
+
+        charge_As = (current_A * dt_s).sum(axis=0)
+        self._charge_As -= charge_As
+        self._charge_used_As += charge_As
+        power_W = current_A * voltage_V
+        self._energy_used_J += (power_W * dt_s).sum(axis=0)
+
+        # y[n] = a[n] y[n - 1] + (1 - a[n]) x[n] with a[n] = exp(-dt[n] / tau)
+        # unrolls over the chunk to a weighted sum of the samples.
+        elapsed_s = np.cumsum(dt_s, axis=0)
+        chunk_s = elapsed_s[-1]
+        weights = -np.expm1(-dt_s / self._tau_s) * np.exp(
+            (elapsed_s - chunk_s) / self._tau_s
+        )
+        decay = np.exp(-chunk_s / self._tau_s)
+        recent_current_A = (weights * current_A).sum(axis=0)
+        recent_power_W = (weights * power_W).sum(axis=0)
+        self._average_current_A = decay * self._average_current_A + recent_current_A
+        self._average_power_W = decay * self._average_power_W + recent_power_W
+        self._elapsed_s += chunk_s
+
+    @property
+    def state_of_charge(self):
+        "Returns the fraction of capacity remaining in each pack."
+        return self._charge_As / self._capacity_As * pq.dimensionless
+
+    @property
+    def remaining_charge(self):
+        "Returns the charge remaining in each pack."
+        return pq.Quantity(self._charge_As, _As).rescale(pq.A * pq.hr)
+
+    @property
+    def remaining_energy(self):
+        "Returns the nominal energy remaining in each pack."
+        energy_J = self._charge_As / self._capacity_As * self._total_energy_J
+        return pq.Quantity(energy_J, pq.J).rescale(pq.W * pq.hr)
+
+    @property
+    def charge_used(self):
+        "Returns the net charge drawn from each pack."
+        return pq.Quantity(self._charge_used_As, _As).rescale(pq.A * pq.hr)
+
+    @property
+    def energy_used(self):
+        "Returns the net energy drawn from each pack."
+        return pq.Quantity(self._energy_used_J, pq.J).rescale(pq.W * pq.hr)
+
+    @property
+    def elapsed(self):
+        "Returns the time covered by the samples of each pack."
+        return self._elapsed_s * pq.s
+
+    def _Debiased(self, average):
+        """Scales an average that started from zero by its total weight."""
+        weight = -np.expm1(-self._elapsed_s / self._tau_s)
+        with np.errstate(divide="ignore", invalid="ignore"):
+            return np.where(weight > 0.0, average / weight, 0.0)
+
+    @property
+    def average_current(self):
+        "Returns the exponentially weighted average current of each pack."
+        return self._Debiased(self._average_current_A) * pq.A
+
+    @property
+    def average_power(self):
+        "Returns the exponentially weighted average power of each pack."
+        return self._Debiased(self._average_power_W) * pq.W
+
+    @property
+    def time_to_empty(self):
+        "Returns the time to empty at the average current (inf if charging)."
+        average_current_A = self._Debiased(self._average_current_A)
+        with np.errstate(divide="ignore", invalid="ignore"):
+            time_s = np.where(
+                average_current_A > 0.0,
+                np.maximum(self._charge_As, 0.0) / average_current_A,
+                np.inf,
+            )
+        return pq.Quantity(time_s, pq.s).rescale(pq.hr)
@@ -0,0 +1,94 @@
+#
+# Copyright (c) 2023, Christopher Hoover
+#
+# SPDX-License-Identifier: BSD-3-Clause
+#
+
+"""Tests for coulomb.py"""
+
+# pylint: disable=missing-function-docstring
+
+import numpy as np
+import quantities as pq
+
+from . import battery, coulomb
+from .test_utils import isclose
+
+
+def _packs():
+    # 12 V, 100 Ah and 24 V, 50 Ah.
+    return [
+        battery.SeriesBattery(
+            cell_chemistry=battery.LithiumFePO4,
+            total_energy=4 * 3.2 * 100.0 * pq.W * pq.hr,
+            n_cells=4,
+        ),
+        battery.SeriesBattery(
+            cell_chemistry=battery.LithiumFePO4,
+            total_energy=8 * 3.2 * 50.0 * pq.W * pq.hr,
+            n_cells=8,
+        ),
+    ]
+
+
+def test_constant_discharge():
+    counter = coulomb.CoulombCounter(_packs())
+    # One hour at 10 A sampled at 10 Hz.
+    n_samples = 36000
+    current = np.full((n_samples, 2), 10.0) * pq.A
+    voltage = np.array([12.8, 25.6]) * pq.V
+    counter.Update(current, voltage, 0.1 * pq.s)
+    assert np.allclose(counter.state_of_charge, [0.9, 0.8])
+    assert np.allclose(
+        counter.charge_used.rescale(pq.A * pq.hr).magnitude, [10.0, 10.0]
+    )
+    assert np.allclose(
+        counter.energy_used.rescale(pq.W * pq.hr).magnitude, [128.0, 256.0]
+    )
+    assert np.allclose(
+        counter.remaining_energy.rescale(pq.W * pq.hr).magnitude, [1152, 1024]
+    )
+    assert np.allclose(counter.average_current.rescale(pq.A).magnitude, [10.0, 10.0])
+    assert np.allclose(counter.average_power.rescale(pq.W).magnitude, [128.0, 256.0])
+    assert np.allclose(counter.time_to_empty.rescale(pq.hr).magnitude, [9.0, 4.0])
+    assert isclose(counter.elapsed[0], 1.0 * pq.hr, atol=1e-6 * pq.s)
+
+
+def test_averages_before_one_tau():
+    counter = coulomb.CoulombCounter(_packs(), tau=60.0 * pq.s)
+    assert np.all(counter.average_current.magnitude == 0.0)
+    assert np.all(np.isinf(counter.time_to_empty.magnitude))
+    # 10 s at 10 A, sampled at 10 Hz.
+    current = np.full((100, 2), 10.0) * pq.A
+    counter.Update(current, np.array([12.8, 25.6]) * pq.V, 0.1 * pq.s)
+    assert np.allclose(counter.average_current.rescale(pq.A).magnitude, [10.0, 10.0])
+    assert np.allclose(counter.average_power.rescale(pq.W).magnitude, [128.0, 256.0])
+    remaining_Ah = np.array([100.0, 50.0]) - 10.0 * 10.0 / 3600.0
+    assert np.allclose(
+        counter.time_to_empty.rescale(pq.hr).magnitude, remaining_Ah / 10.0
+    )
+
+
+def test_chunks_match_single_samples():
+    rng = np.random.default_rng(1)
+    current = rng.uniform(-5.0, 20.0, size=(500, 2)) * pq.A
+    voltage = rng.uniform(12.0, 14.0, size=(500, 2)) * pq.V
+    dt = rng.uniform(0.05, 0.5, size=500) * pq.s
+    chunked = coulomb.CoulombCounter(_packs(), tau=10.0 * pq.s)
+    for start in range(0, 500, 64):
+        chunk = slice(start, start + 64)
+        chunked.Update(current[chunk], voltage[chunk], dt[chunk])
+    single = coulomb.CoulombCounter(_packs(), tau=10.0 * pq.s)
+    for i in range(500):
+        single.Update(current[i], voltage[i], dt[i])
+    for name in ("state_of_charge", "energy_used", "average_current", "average_power"):
+        assert np.allclose(
+            getattr(chunked, name).magnitude, getattr(single, name).magnitude
+        )
+
+
+def test_charging_never_empties():
+    counter = coulomb.CoulombCounter(_packs(), initial_state_of_charge=[0.5, 0.2])
+    counter.Update(np.array([-5.0, -5.0]) * pq.A, 13.6 * pq.V, 60.0 * pq.s)
+    assert np.all(np.isinf(counter.time_to_empty.magnitude))
+    assert np.all(counter.state_of_charge > [0.5, 0.2])
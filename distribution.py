@@ -0,0 +1,254 @@
+#
+# Copyright (c) 2023, Christopher Hoover
+#
+# SPDX-License-Identifier: BSD-3-Clause
+#
+
+"""Cumulative voltage drop in DC distribution trees of panels and loads."""
+
+import dataclasses
+
+import numpy as np
+import quantities as pq
+
+from . import abyc, conductor, resistivity
+
+
+@dataclasses.dataclass(frozen=True)
+class TreeSizing:
+    """Gauges for every circuit of a distribution tree.
+
+    copper_volume counts both the supply and return conductors.
+    lower_bound is a bound on the copper volume of any feasible sizing.
+
+    """
+
+    awg: np.ndarray
+    branch_current: pq.Quantity
+    drop: pq.Quantity
+    drop_pc: np.ndarray
+    copper_volume: pq.Quantity
+    lower_bound: pq.Quantity
+
+
+def _Levels(parent):
+    """The nodes grouped by depth, from the top level down."""
+    n = len(parent)
+    # Counting the -1 parent of top level nodes as node "0" and each node i
+    # as i + 1, order lists the children of each node contiguously.
+    order = np.argsort(parent, kind="stable")
+    counts = np.bincount(parent + 1, minlength=n + 1)
+    starts = np.cumsum(counts) - counts
+    levels = []
+    frontier = order[: counts[0]]
+    n_seen = 0
+    while frontier.size:
+        levels.append(frontier)
+        n_seen += frontier.size
+        n_children = counts[frontier + 1]
+        first_child = np.repeat(starts[frontier + 1], n_children)
+        ends = np.cumsum(n_children)
+        rank = np.arange(ends[-1] if ends.size else 0) - np.repeat(
+            ends - n_children, n_children
+        )
+        frontier = order[first_child + rank]
+    if n_seen != n:
+        raise ValueError("parent has a cycle.")
+    return tuple(levels)
+
+
+class DistributionTree:
+    """A DC distribution tree fed from a single source.
+
+    Each node is a panel or load fed by its own circuit from its parent
+    node, or from the source where parent is -1.  length is the one way
+    length of the circuit, whose return conductor follows the same path.
+    load_current is drawn at each node; panels usually draw none.  The
+    drop at a node is the sum of the drops of the circuits on its path
+    from the source.  Sums up and down the tree take one vectorized step
+    per level.
+
+    """
+
+    def __init__(self, parent, length, load_current):
+        self._parent = np.asarray(parent, dtype=int)
+        n = len(self._parent)
+        if np.any((self._parent < -1) | (self._parent >= n)):
+            raise ValueError("parent must be -1 or a node index.")
+        self._length_m = np.broadcast_to(
+            np.asarray(length.rescale(pq.m).magnitude, dtype=float), (n,)
+        )
+        self._load_current_A = np.broadcast_to(
+            np.asarray(load_current.rescale(pq.A).magnitude, dtype=float), (n,)
+        )
+        self._levels = _Levels(self._parent)
+
+    @property
+    def n_nodes(self):
+        "Returns the number of nodes."
+        return len(self._parent)
+
+    @property
+    def depth(self):
+        "Returns the number of levels."
+        return len(self._levels)
+
+    def _SubtreeSums(self, values):
+        totals = np.array(values, dtype=float)
+        for level in reversed(self._levels[1:]):
+            np.add.at(totals, self._parent[level], totals[level])
+        return totals
+
+    def _PathSums(self, values):
+        totals = np.array(values, dtype=float)
+        for level in self._levels[1:]:
+            totals[level] += totals[self._parent[level]]
+        return totals
+
+    def _SubtreeMins(self, values):
+        mins = np.array(values, dtype=float)
+        for level in reversed(self._levels[1:]):
+            np.minimum.at(mins, self._parent[level], mins[level])
+        return mins
+
+    def BranchCurrents(self):
+        """Returns the current in the circuit feeding each node."""
+        return self._SubtreeSums(self._load_current_A) * pq.A
+
+    def Drops(self, awg, material="copper"):
+        """Returns the cumulative voltage drop at each node for the given
+        gauges of the circuits feeding them.
+
+        """
+        r_per_unit_length = conductor.AWGResistancePerUnitLength(awg, material)
+        edge_drop_V = (
+            self._SubtreeSums(self._load_current_A)
+            * 2.0
+            * self._length_m
+            * r_per_unit_length.rescale(pq.ohm / pq.m).magnitude
+        )
+        return self._PathSums(edge_drop_V) * pq.V
+
+    def Size(
+        self,
+        source_voltage,
+        insulation_temp_rating,
+        drop_pc=3,
+        engine_room=False,
+        material="copper",
+        n_iterations=100,
+    ):
+        """Sizes all the circuits of the tree together.
+
+        Every node drawing current gets at most drop_pc percent drop from
+        the source and every circuit meets the Table VI-B ampacity for its
+        branch current, for the least copper.  Multipliers on the drop at
+        each load price the copper of the circuits above it; for given
+        multipliers the best continuous areas have a closed form.  After
+        n_iterations multiplier updates the continuous areas are scaled to
+        meet the drop, rounded up to Table VI-B gauges, and gauges with
+        slack left below them are reduced.
+
+        engine_room may be an array over the nodes.  For conductors other
+        than copper the Table VI-B currents are scaled by the material's
+        ampacity_factor.
+
+        """
+        budget_V = drop_pc / 100.0 * float(source_voltage.rescale(pq.V))
+        current_A = self._SubtreeSums(self._load_current_A)
+        loaded = self._load_current_A > 0.0
+
+        material = resistivity.GetMaterial(material)
+        sizes = abyc.TableVIBAWGNumbers()
+        area_mm2 = conductor.AWGArea(sizes).magnitude
+        p_ohm_mm2_per_m = float(material.resistivity.rescale(pq.ohm * pq.mm**2 / pq.m))
+        min_size = np.searchsorted(
+            -sizes,
+            -abyc.GetAWGNumbersUpToThreeConductorBundle(
+                current_A / material.ampacity_factor * pq.A,
+                insulation_temp_rating,
+                engine_room=engine_room,
+            ),
+        )
+        # Drop times area, and copper volume over area, of each circuit.
+        drop_area = p_ohm_mm2_per_m * current_A * 2.0 * self._length_m
+        volume_per_area = 2.0 * self._length_m
+
+        def _DropsFor(areas):
+            return self._PathSums(drop_area / areas)
+
+        if np.any(_DropsFor(np.full_like(drop_area, area_mm2[-1]))[loaded] > budget_V):
+            raise ValueError("No acceptable wire guage for the tree.")
+
+        # Start each load's multiplier where it would be met on its own.
+        path_cost = self._PathSums(
+            volume_per_area * np.sqrt(p_ohm_mm2_per_m * current_A)
+        )
+        multipliers = np.where(loaded, (path_cost / budget_V) ** 2, 0.0)
+        min_area, max_area = area_mm2[min_size], area_mm2[-1]
+
+        def _Areas(multipliers):
+            weights = self._SubtreeSums(multipliers)
+            areas = np.sqrt(weights * drop_area / volume_per_area)
+            return weights, np.clip(np.nan_to_num(areas), min_area, max_area)
+
+        lower_bound = 0.0
+        with np.errstate(divide="ignore", invalid="ignore"):
+            for _ in range(n_iterations):
+                weights, areas = _Areas(multipliers)
+                dual = np.sum(volume_per_area * areas + weights * drop_area / areas)
+                lower_bound = max(lower_bound, dual - budget_V * multipliers.sum())
+                multipliers *= np.where(loaded, _DropsFor(areas) / budget_V, 0.0) ** 2
+            _, areas = _Areas(multipliers)
+        ratio = _DropsFor(areas)[loaded] / budget_V
+
+        # Scaling every area by the worst ratio meets every drop, short of
+        # the largest gauge.
+        areas = np.minimum(areas * max(1.0, ratio.max(initial=0.0)), max_area)
+        chosen = np.maximum(np.searchsorted(area_mm2, areas * (1.0 - 1e-12)), min_size)
+        chosen = self._Repair(chosen, area_mm2, drop_area, loaded, budget_V)
+        chosen = self._Reduce(chosen, min_size, area_mm2, drop_area, loaded, budget_V)
+
+        drop_V = _DropsFor(area_mm2[chosen])
+        volume_mm2_m = np.sum(volume_per_area * area_mm2[chosen])
+        return TreeSizing(
+            awg=sizes[chosen],
+            branch_current=current_A * pq.A,
+            drop=drop_V * pq.V,
+            drop_pc=100.0 * drop_V / float(source_voltage.rescale(pq.V)),
+            copper_volume=pq.Quantity(volume_mm2_m, pq.mm**2 * pq.m).rescale(pq.cm**3),
+            lower_bound=pq.Quantity(lower_bound, pq.mm**2 * pq.m).rescale(pq.cm**3),
+        )
+
+    def _Repair(self, chosen, area_mm2, drop_area, loaded, budget_V):
+        """Steps up the gauges above loads over budget until none are."""
+        while True:
+            over = loaded & (self._PathSums(drop_area / area_mm2[chosen]) > budget_V)
+            if not over.any():
+                return chosen
+            above = self._SubtreeSums(over) > 0.0
+            chosen = np.where(above, np.minimum(chosen + 1, len(area_mm2) - 1), chosen)
+
+    def _Reduce(self, chosen, min_size, area_mm2, drop_area, loaded, budget_V):
+        """Steps down gauges, deepest first, while no load goes over budget."""
+        chosen = chosen.copy()
+        drop_V = self._PathSums(drop_area / area_mm2[chosen])
+        slack_V = self._SubtreeMins(np.where(loaded, budget_V - drop_V, np.inf))
+        for level in reversed(self._levels):
+            while True:
+                smaller = chosen[level] - 1
+                can = smaller >= min_size[level]
+                smaller = np.maximum(smaller, 0)
+                extra_V = drop_area[level] * (
+                    1.0 / area_mm2[smaller] - 1.0 / area_mm2[chosen[level]]
+                )
+                can &= extra_V <= slack_V[level]
+                if not can.any():
+                    break
+                nodes = level[can]
+                chosen[nodes] = smaller[can]
+                slack_V[nodes] -= extra_V[can]
+            parents = self._parent[level]
+            top = parents < 0
+            np.minimum.at(slack_V, parents[~top], slack_V[level[~top]])
+        return chosen
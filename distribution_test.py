@@ -0,0 +1,139 @@
+#
+# Copyright (c) 2023, Christopher Hoover
+#
+# SPDX-License-Identifier: BSD-3-Clause
+#
+
+"""Distribution tree test."""
+
+# pylint: disable=missing-function-docstring
+# pylint: disable=invalid-name
+
+import itertools
+
+import numpy as np
+import pytest
+import quantities as pq
+
+from . import abyc, distribution, wire
+from .test_utils import isclose
+
+# A main panel (0) feeding a sub panel (1) and a load (2); the sub panel
+# feeds two loads (3, 4).  Node 5 is a load fed straight from the source.
+_PARENT = [-1, 0, 0, 1, 1, -1]
+_LENGTH = [3.0, 6.0, 2.0, 4.0, 1.0, 5.0] * pq.m
+_LOAD = [0.0, 0.0, 10.0, 5.0, 2.0, 8.0] * pq.A
+
+
+def _Tree():
+    return distribution.DistributionTree(_PARENT, _LENGTH, _LOAD)
+
+
+def testBranchCurrents():
+    tree = _Tree()
+    assert tree.n_nodes == 6
+    assert tree.depth == 3
+    assert np.array_equal(tree.BranchCurrents().magnitude, [17, 7, 10, 5, 2, 8])
+
+
+def testDrops():
+    awg = [4, 8, 12, 14, 16, 10]
+    drops = _Tree().Drops(awg)
+
+    def _Drop(node):
+        current = _Tree().BranchCurrents()[node]
+        r = wire.SolidWireResistancePerUnitLength(awg[node])
+        return (current * r * 2.0 * _LENGTH[node]).rescale(pq.V)
+
+    assert isclose(drops[0], _Drop(0), 1e-9 * pq.V)
+    assert isclose(drops[4], _Drop(0) + _Drop(1) + _Drop(4), 1e-9 * pq.V)
+    assert isclose(drops[5], _Drop(5), 1e-9 * pq.V)
+
+
+def testCycle():
+    with pytest.raises(ValueError):
+        distribution.DistributionTree([1, 0], [1.0, 1.0] * pq.m, [1.0, 1.0] * pq.A)
+
+
+def testSize():
+    sizing = _Tree().Size(12 * pq.V, 105 * pq.C, drop_pc=3)
+    loaded = _LOAD.magnitude > 0.0
+    assert np.all(sizing.drop_pc[loaded] <= 3.0)
+    assert np.all(
+        sizing.awg
+        <= abyc.GetAWGNumbersUpToThreeConductorBundle(sizing.branch_current, 105 * pq.C)
+    )
+    assert np.allclose(sizing.drop.magnitude, _Tree().Drops(sizing.awg).magnitude)
+    assert sizing.lower_bound <= sizing.copper_volume
+
+
+def testSizeNearExhaustiveSearch():
+    # A panel feeding two loads, and a load fed from the source.
+    length = [4.0, 2.0, 3.0, 6.0] * pq.m
+    load = [0.0, 12.0, 6.0, 9.0] * pq.A
+    tree = distribution.DistributionTree([-1, 0, 0, -1], length, load)
+    sizing = tree.Size(24 * pq.V, 105 * pq.C, drop_pc=3)
+
+    sizes = abyc.TableVIBAWGNumbers()
+    current_A = tree.BranchCurrents().magnitude
+    r_ohm_per_m = np.array(
+        [
+            float(wire.SolidWireResistancePerUnitLength(a).rescale(pq.ohm / pq.m))
+            for a in sizes
+        ]
+    )
+    area_mm2 = np.array(
+        [float(wire.SolidWireCrossSectionalArea(a).rescale(pq.mm**2)) for a in sizes]
+    )
+    grid = np.array(list(itertools.product(range(len(sizes)), repeat=4)))
+    edge_V = current_A * 2.0 * length.magnitude * r_ohm_per_m[grid]
+    feasible = (
+        (edge_V[:, 0] + edge_V[:, 1] <= 0.72)
+        & (edge_V[:, 0] + edge_V[:, 2] <= 0.72)
+        & (edge_V[:, 3] <= 0.72)
+        & np.all(
+            sizes[grid]
+            <= abyc.GetAWGNumbersUpToThreeConductorBundle(current_A * pq.A, 105 * pq.C),
+            axis=1,
+        )
+    )
+    volume_mm2_m = (2.0 * length.magnitude * area_mm2[grid]).sum(axis=1)
+    best = pq.Quantity(volume_mm2_m[feasible].min(), pq.mm**2 * pq.m).rescale(pq.cm**3)
+    assert sizing.lower_bound <= best * (1 + 1e-9)
+    assert best <= sizing.copper_volume <= 1.1 * best
+
+
+def testSizeLargeTree():
+    rng = np.random.default_rng(0)
+    n = 20_000
+    # 20 panels off the source, 400 sub panels, and loads on both.
+    parent = np.concatenate(
+        (
+            np.full(20, -1),
+            rng.integers(0, 20, 400),
+            rng.integers(0, 420, n - 420),
+        )
+    )
+    length = np.concatenate((np.full(420, 5.0), rng.uniform(0.5, 10.0, n - 420)))
+    load = np.concatenate((np.zeros(420), rng.uniform(0.01, 0.2, n - 420)))
+    tree = distribution.DistributionTree(parent, length * pq.m, load * pq.A)
+    sizing = tree.Size(12 * pq.V, 105 * pq.C, drop_pc=3)
+    assert np.all(sizing.drop_pc <= 3.0)
+    assert sizing.copper_volume <= 1.05 * sizing.lower_bound
+
+
+def testSizeNoAcceptableGauge():
+    tree = distribution.DistributionTree([-1], [100.0] * pq.m, [200.0] * pq.A)
+    with pytest.raises(ValueError):
+        tree.Size(12 * pq.V, 105 * pq.C)
+
+
+def testSizeAluminum():
+    copper = _Tree().Size(12 * pq.V, 105 * pq.C, drop_pc=3)
+    aluminum = _Tree().Size(12 * pq.V, 105 * pq.C, drop_pc=3, material="aluminum")
+    assert np.all(aluminum.awg <= copper.awg)
+    assert np.all(aluminum.drop_pc[_LOAD.magnitude > 0.0] <= 3.0)
+    assert np.allclose(
+        aluminum.drop.magnitude,
+        _Tree().Drops(aluminum.awg, "aluminum").magnitude,
+    )
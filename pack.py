@@ -0,0 +1,272 @@
+#
+# Copyright (c) 2023, Christopher Hoover
+#
+# SPDX-License-Identifier: BSD-3-Clause
+#
+
+"""Cell level simulation of battery packs with cell-to-cell variation."""
+
+import dataclasses
+import math
+
+import numpy as np
+import quantities as pq
+
+from . import battery
+
+_As = pq.A * pq.s
+
+
+@dataclasses.dataclass(frozen=True)
+class OpenCircuitVoltage:
+    """Cell open circuit voltage against state of charge, and the cell
+    voltage limits for discharge and charge.
+
+    """
+
+    state_of_charge: tuple
+    voltage: pq.Quantity
+    min_voltage: pq.Quantity
+    max_voltage: pq.Quantity
+
+
+# Typical curves at 25 C.
+OPEN_CIRCUIT_VOLTAGES = {
+    battery.LithiumNMC.name: OpenCircuitVoltage(
+        state_of_charge=(0.0, 0.05, 0.1, 0.2, 0.3, 0.4, 0.5, 0.6, 0.7, 0.8, 0.9, 1.0),
+        voltage=[3.0, 3.3, 3.45, 3.55, 3.6, 3.63, 3.67, 3.73, 3.8, 3.9, 4.02, 4.2]
+        * pq.V,
+        min_voltage=2.8 * pq.V,
+        max_voltage=4.2 * pq.V,
+    ),
+    battery.LithiumFePO4.name: OpenCircuitVoltage(
+        state_of_charge=(0.0, 0.05, 0.1, 0.2, 0.3, 0.4, 0.5, 0.6, 0.7, 0.8, 0.9, 1.0),
+        voltage=[2.6, 3.0, 3.2, 3.25, 3.27, 3.28, 3.29, 3.3, 3.31, 3.33, 3.35, 3.6]
+        * pq.V,
+        min_voltage=2.5 * pq.V,
+        max_voltage=3.65 * pq.V,
+    ),
+    battery.LeadAcid.name: OpenCircuitVoltage(
+        state_of_charge=(0.0, 1.0),
+        voltage=[1.95, 2.12] * pq.V,
+        min_voltage=1.75 * pq.V,
+        max_voltage=2.4 * pq.V,
+    ),
+}
+
+
+def SampleCells(
+    n_series,
+    n_parallel,
+    capacity,
+    resistance,
+    capacity_spread_pc=2.0,
+    resistance_spread_pc=5.0,
+    seed=None,
+):
+    """Draws normally distributed cell capacities and resistances.
+
+    The spreads are standard deviations as percentages of the nominal
+    values.  Returns (capacity, resistance) arrays of shape (n_series,
+    n_parallel).
+
+    """
+    rng = np.random.default_rng(seed)
+    shape = (n_series, n_parallel)
+    capacity_factor = rng.normal(1.0, capacity_spread_pc / 100.0, shape)
+    resistance_factor = rng.normal(1.0, resistance_spread_pc / 100.0, shape)
+    return (
+        pq.Quantity(
+            float(capacity.rescale(pq.A * pq.hr)) * capacity_factor, pq.A * pq.hr
+        ),
+        pq.Quantity(float(resistance.rescale(pq.ohm)) * resistance_factor, pq.ohm),
+    )
+
+
+@dataclasses.dataclass(frozen=True)
+class PackTrace:
+    """Pack level history of PackSimulator.Run(), one entry per step.
+
+    limited is True if the run stopped early at a cell voltage or state of
+    charge limit.
+
+    """
+
+    time: pq.Quantity
+    current: pq.Quantity
+    voltage: pq.Quantity
+    min_cell_voltage: pq.Quantity
+    max_cell_voltage: pq.Quantity
+    state_of_charge_spread: np.ndarray
+    energy: pq.Quantity
+    limited: bool
+
+
+class PackSimulator:
+    """A pack of n_series parallel groups of n_parallel cells.
+
+    cell_capacity and cell_resistance have shape (n_series, n_parallel) and
+    give each cell its own capacity and internal resistance.  The cells of
+    a parallel group share a terminal voltage, so the pack current divides
+    among them by their open circuit voltages and resistances.  Each step
+    updates every cell at once; the state is a few arrays the size of the
+    pack.
+
+    """
+
+    def __init__(
+        self,
+        cell_chemistry,
+        cell_capacity,
+        cell_resistance,
+        open_circuit_voltage=None,
+        initial_state_of_charge=1.0,
+    ):
+        if open_circuit_voltage is None:
+            open_circuit_voltage = OPEN_CIRCUIT_VOLTAGES[cell_chemistry.name]
+        self._cell_chemistry = cell_chemistry
+        self._capacity_As = np.atleast_2d(
+            np.asarray(cell_capacity.rescale(_As).magnitude, dtype=float)
+        )
+        conductance_S = 1.0 / np.asarray(
+            cell_resistance.rescale(pq.ohm).magnitude, dtype=float
+        )
+        self._conductance_S = np.broadcast_to(conductance_S, self._capacity_As.shape)
+        self._group_conductance_S = self._conductance_S.sum(axis=1)
+        self._soc_points = np.asarray(open_circuit_voltage.state_of_charge, dtype=float)
+        self._ocv_points_V = np.asarray(
+            open_circuit_voltage.voltage.rescale(pq.V).magnitude, dtype=float
+        )
+        self._min_voltage_V = float(open_circuit_voltage.min_voltage.rescale(pq.V))
+        self._max_voltage_V = float(open_circuit_voltage.max_voltage.rescale(pq.V))
+        self._charge_As = self._capacity_As * np.broadcast_to(
+            np.asarray(initial_state_of_charge, dtype=float), self._capacity_As.shape
+        )
+
+    @property
+    def n_series(self):
+        "Returns the number of parallel groups in series."
+        return self._capacity_As.shape[0]
+
+    @property
+    def n_parallel(self):
+        "Returns the number of cells in each parallel group."
+        return self._capacity_As.shape[1]
+
+    @property
+    def n_cells(self):
+        "Returns the number of cells."
+        return self._capacity_As.size
+
+    @property
+    def state_of_charge(self):
+        "Returns the state of charge of each cell."
+        return self._charge_As / self._capacity_As
+
+    @property
+    def group_state_of_charge(self):
+        "Returns the state of charge of each parallel group."
+        return self._charge_As.sum(axis=1) / self._capacity_As.sum(axis=1)
+
+    @property
+    def imbalance(self):
+        "Returns the spread in state of charge between cells."
+        state_of_charge = self.state_of_charge
+        return float(state_of_charge.max() - state_of_charge.min())
+
+    @property
+    def capacity(self):
+        "Returns the capacity of the weakest parallel group."
+        return pq.Quantity(self._capacity_As.sum(axis=1).min(), _As).rescale(
+            pq.A * pq.hr
+        )
+
+    @property
+    def nominal_energy(self):
+        "Returns the energy of the pack if every group matched the average."
+        group_As = self._capacity_As.sum(axis=1).mean()
+        energy_J = (
+            self.n_series
+            * group_As
+            * float(self._cell_chemistry.cell_voltage.rescale(pq.V))
+        )
+        return pq.Quantity(energy_J, pq.J).rescale(pq.W * pq.hr)
+
+    def _Step(self, current_A):
+        """The cell currents and group voltages for a pack current."""
+        ocv_V = np.interp(
+            self._charge_As / self._capacity_As, self._soc_points, self._ocv_points_V
+        )
+        group_V = (
+            (ocv_V * self._conductance_S).sum(axis=1) - current_A
+        ) / self._group_conductance_S
+        cell_A = (ocv_V - group_V[:, np.newaxis]) * self._conductance_S
+        return cell_A, group_V
+
+    def Run(self, current, dt, stop_at_limit=True):
+        """Applies a pack current profile, positive when discharging.
+
+        Each sample of current is held for dt.  With stop_at_limit the run
+        stops before the first step that would take a parallel group
+        outside the cell voltage limits or a cell below empty or above
+        full.  Returns a PackTrace.
+
+        """
+        current_A = np.ravel(np.asarray(current.rescale(pq.A).magnitude, dtype=float))
+        dt_s = float(dt.rescale(pq.s))
+        n = len(current_A)
+        voltage_V = np.empty(n)
+        min_cell_V = np.empty(n)
+        max_cell_V = np.empty(n)
+        spread = np.empty(n)
+        limited = False
+        for i in range(n):
+            cell_A, group_V = self._Step(current_A[i])
+            charge_As = self._charge_As - cell_A * dt_s
+            min_cell_V[i] = group_V.min()
+            max_cell_V[i] = group_V.max()
+            if stop_at_limit and (
+                min_cell_V[i] < self._min_voltage_V
+                or max_cell_V[i] > self._max_voltage_V
+                or np.any(charge_As < 0.0)
+                or np.any(charge_As > self._capacity_As)
+            ):
+                limited = True
+                n = i
+                break
+            voltage_V[i] = group_V.sum()
+            self._charge_As = charge_As
+            state_of_charge = charge_As / self._capacity_As
+            spread[i] = state_of_charge.max() - state_of_charge.min()
+        energy_J = np.cumsum(voltage_V[:n] * current_A[:n] * dt_s)
+        return PackTrace(
+            time=np.arange(1, n + 1) * dt_s * pq.s,
+            current=current_A[:n] * pq.A,
+            voltage=voltage_V[:n] * pq.V,
+            min_cell_voltage=min_cell_V[:n] * pq.V,
+            max_cell_voltage=max_cell_V[:n] * pq.V,
+            state_of_charge_spread=spread[:n],
+            energy=pq.Quantity(energy_J, pq.J).rescale(pq.W * pq.hr),
+            limited=limited,
+        )
+
+    def UsableEnergy(self, current, dt=10.0 * pq.s):
+        """Returns the energy delivered at a constant discharge current
+        until the weakest parallel group reaches its limit.  The pack itself
+        is left unchanged.
+
+        """
+        current_A = float(current.rescale(pq.A))
+        if current_A <= 0.0:
+            raise ValueError("current must be a discharge current, above zero.")
+        dt_s = float(dt.rescale(pq.s))
+        # No group can deliver more than all of its charge.
+        n_steps = math.ceil(self._charge_As.sum(axis=1).max() / (current_A * dt_s)) + 1
+        charge_As = self._charge_As.copy()
+        try:
+            trace = self.Run(np.full(n_steps, current_A) * pq.A, dt)
+        finally:
+            self._charge_As = charge_As
+        if len(trace.energy) == 0:
+            return 0.0 * pq.W * pq.hr
+        return trace.energy[-1]
@@ -0,0 +1,103 @@
+#
+# Copyright (c) 2023, Christopher Hoover
+#
+# SPDX-License-Identifier: BSD-3-Clause
+#
+
+"""Pack simulation test."""
+
+# pylint: disable=missing-function-docstring
+# pylint: disable=invalid-name
+
+import numpy as np
+import pytest
+import quantities as pq
+
+from . import battery, pack
+from .test_utils import isclose
+
+
+def _Pack(n_series, n_parallel, capacity_spread_pc=0.0, resistance_spread_pc=0.0):
+    capacity, resistance = pack.SampleCells(
+        n_series,
+        n_parallel,
+        5.0 * pq.A * pq.hr,
+        0.03 * pq.ohm,
+        capacity_spread_pc=capacity_spread_pc,
+        resistance_spread_pc=resistance_spread_pc,
+        seed=1,
+    )
+    return pack.PackSimulator(battery.LithiumNMC, capacity, resistance)
+
+
+def testIdenticalCells():
+    simulator = _Pack(4, 2)
+    assert simulator.n_cells == 8
+    assert isclose(simulator.capacity, 10.0 * pq.A * pq.hr, 1e-9 * pq.A * pq.hr)
+    assert isclose(simulator.nominal_energy, 144.0 * pq.W * pq.hr, 1e-9 * pq.W * pq.hr)
+    trace = simulator.Run(np.full(10, 10.0) * pq.A, 60.0 * pq.s)
+    assert not trace.limited
+    # 4 groups at 4.2 V open circuit, less 5 A through 30 mohm per cell.
+    assert isclose(trace.voltage[0], 4 * (4.2 - 0.15) * pq.V, 1e-9 * pq.V)
+    assert np.allclose(simulator.state_of_charge, 1.0 - 10.0 * (10.0 / 60.0) / 10.0)
+    assert simulator.imbalance < 1e-12
+
+
+def testParallelCurrentSharing():
+    capacity = [[5.0, 5.0]] * pq.A * pq.hr
+    resistance = [[0.02, 0.04]] * pq.ohm
+    simulator = pack.PackSimulator(battery.LithiumNMC, capacity, resistance)
+    simulator.Run([3.0] * pq.A, 1.0 * pq.s)
+    # The lower resistance cell carries two thirds of the current.
+    charge_used_As = (1.0 - simulator.state_of_charge) * 5.0 * 3600.0
+    assert np.allclose(charge_used_As, [[2.0, 1.0]])
+
+
+def testDischargeStopsAtWeakestGroup():
+    simulator = _Pack(20, 1, capacity_spread_pc=5.0)
+    trace = simulator.Run(np.full(1000, 5.0) * pq.A, 10.0 * pq.s)
+    assert trace.limited
+    assert np.isclose(simulator.group_state_of_charge.min(), 0.0, atol=0.02)
+    assert simulator.group_state_of_charge.max() > 0.05
+    assert simulator.imbalance > 0.05
+    assert np.all(np.diff(trace.state_of_charge_spread) >= 0.0)
+
+
+def testChargeStopsAtMaxVoltage():
+    capacity, resistance = pack.SampleCells(
+        10, 2, 5.0 * pq.A * pq.hr, 0.03 * pq.ohm, seed=2
+    )
+    simulator = pack.PackSimulator(
+        battery.LithiumNMC, capacity, resistance, initial_state_of_charge=0.2
+    )
+    trace = simulator.Run(np.full(1000, -10.0) * pq.A, 10.0 * pq.s)
+    assert trace.limited
+    assert trace.max_cell_voltage.max() <= 4.2 * pq.V
+    assert trace.energy[-1] < 0.0 * pq.W * pq.hr
+
+
+def testUsableEnergy():
+    matched = _Pack(50, 1)
+    spread = _Pack(50, 1, capacity_spread_pc=5.0, resistance_spread_pc=10.0)
+    matched_energy = matched.UsableEnergy(5.0 * pq.A)
+    spread_energy = spread.UsableEnergy(5.0 * pq.A)
+    assert matched_energy < matched.nominal_energy
+    assert spread_energy < 0.95 * matched_energy
+    # The pack is left as it was.
+    assert np.all(spread.state_of_charge == 1.0)
+
+
+@pytest.mark.parametrize("current", [0.0, -5.0])
+def testUsableEnergyNeedsDischargeCurrent(current):
+    with pytest.raises(ValueError):
+        _Pack(2, 1).UsableEnergy(current * pq.A)
+
+
+def testFullCycleOfLargePack():
+    simulator = _Pack(100, 100, capacity_spread_pc=2.0, resistance_spread_pc=5.0)
+    assert simulator.n_cells == 10_000
+    discharge = simulator.Run(np.full(400, 500.0) * pq.A, 10.0 * pq.s)
+    charge = simulator.Run(np.full(400, -250.0) * pq.A, 20.0 * pq.s)
+    assert discharge.limited
+    assert charge.limited
+    assert charge.energy[-1] < -discharge.energy[-1]
@@ -6,7 +6,69 @@
 
 """Resistivity."""
 
+import dataclasses
+import math
+
 import quantities as pq
 
 p_Cu = 17.24e-9 * pq.ohm * pq.m  # annealed
 p_Al = 26.5e-9 * pq.ohm * pq.m
+
+# Resistivities are given at this temperature.
+REFERENCE_TEMPERATURE = 20.0 * pq.C
+
+
+@dataclasses.dataclass(frozen=True)
+class Material:
+    """Conductor material.
+
+    alpha is the temperature coefficient of resistivity per kelvin at
+    REFERENCE_TEMPERATURE.
+
+    """
+
+    name: str
+    resistivity: pq.Quantity
+    alpha: float
+
+    @property
+    def ampacity_factor(self):
+        """Returns the current, relative to annealed copper, that heats a
+        conductor of the same size as much.
+
+        """
+        return math.sqrt(float(p_Cu / self.resistivity))
+
+    def ResistivityAt(self, temperature):
+        "Returns the resistivity at the given temperature."
+        rise = temperature.rescale(pq.C).magnitude - float(REFERENCE_TEMPERATURE)
+        return self.resistivity * (1.0 + self.alpha * rise)
+
+
+Copper = Material(name="copper", resistivity=p_Cu, alpha=0.00393)
+TinnedCopper = Material(
+    name="tinned copper", resistivity=17.54e-9 * pq.ohm * pq.m, alpha=0.00393
+)
+Aluminum = Material(name="aluminum", resistivity=p_Al, alpha=0.00403)
+CopperCladAluminum = Material(
+    name="copper-clad aluminum", resistivity=25.93e-9 * pq.ohm * pq.m, alpha=0.00410
+)
+Silver = Material(name="silver", resistivity=15.87e-9 * pq.ohm * pq.m, alpha=0.0038)
+Nickel = Material(name="nickel", resistivity=69.9e-9 * pq.ohm * pq.m, alpha=0.0060)
+
+MATERIALS = {
+    material.name: material
+    for material in (Copper, TinnedCopper, Aluminum, CopperCladAluminum, Silver, Nickel)
+}
+
+
+def GetMaterial(material):
+    """Returns the Material given it or its name."""
+    if isinstance(material, Material):
+        return material
+    try:
+        return MATERIALS[material]
+    except KeyError:
+        raise KeyError(
+            f"Unknown material {material}; known materials: {list(MATERIALS)}"
+        ) from None
@@ -0,0 +1,286 @@
+#
+# Copyright (c) 2023, Christopher Hoover
+#
+# SPDX-License-Identifier: BSD-3-Clause
+#
+
+"""Streaming voltage drop analysis of logged circuit currents."""
+
+import dataclasses
+
+import numpy as np
+import quantities as pq
+
+from . import resistivity, wire
+
+# ABYC E-11 Tables IX and X.
+DROP_BUDGETS_PC = (3, 10)
+
+
+@dataclasses.dataclass(frozen=True)
+class DropExcursions:
+    """Time spent with the voltage drop over budget_pc percent."""
+
+    budget_pc: float
+    samples: int
+    events: int
+    longest: float
+    total: float
+
+
+def _Runs(flags, carried):
+    """Lengths of the runs of True in flags, the first extended by carried.
+
+    Returns (lengths, continues) where continues is True if the first run
+    continues one carried over from the previous chunk.
+
+    """
+    edges = np.diff(np.concatenate(([0], flags.view(np.int8), [0])))
+    lengths = np.flatnonzero(edges == -1) - np.flatnonzero(edges == 1)
+    continues = bool(carried and len(flags) and flags[0])
+    if continues:
+        lengths[0] += carried
+    return lengths, continues
+
+
+class _Summary:
+    """Minimum, maximum, mean and a histogram of the drop of some samples."""
+
+    def __init__(self, n_bins):
+        self.histogram = np.zeros(n_bins)
+        self.Reset()
+
+    def Reset(self):
+        self.histogram[:] = 0.0
+        self.n_samples = 0
+        self.min_load_voltage_V = np.inf
+        self.max_drop_V = -np.inf
+        self.min_drop_pc = np.inf
+        self.max_drop_pc = -np.inf
+        self.sum_drop_V = 0.0
+
+    def Add(self, drop_V, load_V, drop_pc, bins):
+        self.n_samples += len(drop_V)
+        self.min_load_voltage_V = min(self.min_load_voltage_V, load_V.min())
+        self.max_drop_V = max(self.max_drop_V, drop_V.max())
+        self.min_drop_pc = min(self.min_drop_pc, drop_pc.min())
+        self.max_drop_pc = max(self.max_drop_pc, drop_pc.max())
+        self.sum_drop_V += drop_V.sum()
+        self.histogram += np.bincount(bins, minlength=len(self.histogram))
+
+    def Update(self, other):
+        self.n_samples += other.n_samples
+        self.min_load_voltage_V = min(self.min_load_voltage_V, other.min_load_voltage_V)
+        self.max_drop_V = max(self.max_drop_V, other.max_drop_V)
+        self.min_drop_pc = min(self.min_drop_pc, other.min_drop_pc)
+        self.max_drop_pc = max(self.max_drop_pc, other.max_drop_pc)
+        self.sum_drop_V += other.sum_drop_V
+        self.histogram += other.histogram
+
+    def Check(self):
+        if not self.n_samples:
+            raise ValueError("No samples.")
+        return self
+
+    def Percentile(self, q, resolution_pc):
+        """The q-th percentile of the drop in percent, rounded up to the
+        histogram resolution and within the observed range.
+
+        """
+        self.Check()
+        cumulative = np.cumsum(self.histogram)
+        # The first sample has rank 1.
+        rank = max(q / 100.0 * self.n_samples, 1.0)
+        index = min(np.searchsorted(cumulative, rank), len(cumulative) - 1)
+        percentile_pc = min((index + 1) * resolution_pc, self.max_drop_pc)
+        return max(percentile_pc, self.min_drop_pc)
+
+
+class VoltageDropAnalyzer:
+    """Voltage at the load of a circuit, from its logged current.
+
+    The circuit is a conductor of the given AWG and resistivity whose full
+    length runs from the source to the load and back.  Current samples are
+    fed to Update() in chunks taken every sample_interval.  Statistics are
+    kept over the whole log and, if window is given, over a rolling window
+    of about that duration.  Minimum, maximum and mean are exact;
+    percentiles come from histograms of the drop with
+    percentile_resolution_pc wide bins.  Memory does not grow with the
+    length of the log.
+
+    The window is made of n_window_blocks blocks of samples, the oldest of
+    which is dropped as a new one starts, so it covers between
+    (n_window_blocks - 1) / n_window_blocks of window and window.
+
+    """
+
+    def __init__(
+        self,
+        awg,
+        full_circuit_length,
+        source_voltage,
+        sample_interval,
+        budgets_pc=DROP_BUDGETS_PC,
+        p=resistivity.p_Cu,
+        percentile_resolution_pc=0.01,
+        window=None,
+        n_window_blocks=10,
+    ):
+        r_per_unit_length = wire.SolidWireResistancePerUnitLength(awg, p=p)
+        resistance = r_per_unit_length * full_circuit_length
+        self._resistance_ohm = float(resistance.rescale(pq.ohm))
+        self._source_voltage_V = float(source_voltage.rescale(pq.V))
+        self._sample_interval_s = float(sample_interval.rescale(pq.s))
+        self._budgets_pc = tuple(budgets_pc)
+        self._resolution_pc = percentile_resolution_pc
+        # Drops of 100 % and more share the last bin.
+        n_bins = int(np.ceil(100.0 / percentile_resolution_pc)) + 1
+        self._summary = _Summary(n_bins)
+        if window is None:
+            self._blocks = ()
+        else:
+            window_samples = float(window.rescale(pq.s)) / self._sample_interval_s
+            self._block_samples = max(1, int(np.ceil(window_samples / n_window_blocks)))
+            self._blocks = tuple(_Summary(n_bins) for _ in range(n_window_blocks))
+            self._block = 0
+        n_budgets = len(self._budgets_pc)
+        self._samples_over = np.zeros(n_budgets, dtype=int)
+        self._events = np.zeros(n_budgets, dtype=int)
+        self._longest = np.zeros(n_budgets, dtype=int)
+        self._carried = np.zeros(n_budgets, dtype=int)
+
+    @property
+    def resistance(self):
+        "Returns the resistance of the full circuit."
+        return self._resistance_ohm * pq.ohm
+
+    def Update(self, current, source_voltage=None):
+        """Analyzes a chunk of current samples.
+
+        source_voltage, if given, is the measured source voltage for each
+        sample instead of the nominal one.  Returns the voltage drop and the
+        voltage at the load for each sample.
+
+        """
+        current_A = np.ravel(current.rescale(pq.A).magnitude).astype(float)
+        if source_voltage is None:
+            source_V = np.full_like(current_A, self._source_voltage_V)
+        else:
+            source_V = np.broadcast_to(
+                source_voltage.rescale(pq.V).magnitude, current_A.shape
+            )
+        drop_V = current_A * self._resistance_ohm
+        load_V = source_V - drop_V
+        drop_pc = 100.0 * drop_V / source_V
+        if len(current_A):
+            self._Accumulate(drop_V, load_V, drop_pc)
+        return drop_V * pq.V, load_V * pq.V
+
+    def _Accumulate(self, drop_V, load_V, drop_pc):
+        bins = np.clip(
+            np.floor(drop_pc / self._resolution_pc),
+            0,
+            len(self._summary.histogram) - 1,
+        ).astype(int)
+        self._summary.Add(drop_V, load_V, drop_pc, bins)
+        start = 0
+        while self._blocks and start < len(drop_V):
+            block = self._blocks[self._block]
+            if block.n_samples == self._block_samples:
+                self._block = (self._block + 1) % len(self._blocks)
+                block = self._blocks[self._block]
+                block.Reset()
+            stop = min(len(drop_V), start + self._block_samples - block.n_samples)
+            block.Add(
+                drop_V[start:stop],
+                load_V[start:stop],
+                drop_pc[start:stop],
+                bins[start:stop],
+            )
+            start = stop
+        for i, budget_pc in enumerate(self._budgets_pc):
+            over = drop_pc > budget_pc
+            lengths, continues = _Runs(over, self._carried[i])
+            self._samples_over[i] += np.count_nonzero(over)
+            self._events[i] += len(lengths) - continues
+            if len(lengths):
+                self._longest[i] = max(self._longest[i], lengths.max())
+            self._carried[i] = lengths[-1] if over[-1] else 0
+
+    @property
+    def n_samples(self):
+        "Returns the number of samples analyzed."
+        return self._summary.n_samples
+
+    @property
+    def min_load_voltage(self):
+        "Returns the lowest voltage at the load."
+        return self._summary.Check().min_load_voltage_V * pq.V
+
+    @property
+    def max_drop(self):
+        "Returns the largest voltage drop."
+        return self._summary.Check().max_drop_V * pq.V
+
+    @property
+    def max_drop_pc(self):
+        "Returns the largest voltage drop as a percentage of the source."
+        return self._summary.Check().max_drop_pc
+
+    @property
+    def mean_drop(self):
+        "Returns the mean voltage drop."
+        summary = self._summary.Check()
+        return summary.sum_drop_V / summary.n_samples * pq.V
+
+    def DropPercentile(self, q):
+        """Returns the q-th percentile of the drop as a percentage of the
+        source, rounded up to the histogram resolution.
+
+        """
+        return self._summary.Percentile(q, self._resolution_pc)
+
+    def _Window(self):
+        if not self._blocks:
+            raise ValueError("No window.")
+        window = _Summary(len(self._summary.histogram))
+        for block in self._blocks:
+            window.Update(block)
+        return window
+
+    @property
+    def window_n_samples(self):
+        "Returns the number of samples in the rolling window."
+        return self._Window().n_samples
+
+    @property
+    def window_min_load_voltage(self):
+        "Returns the lowest voltage at the load in the rolling window."
+        return self._Window().Check().min_load_voltage_V * pq.V
+
+    @property
+    def window_max_drop_pc(self):
+        "Returns the largest drop percentage in the rolling window."
+        return self._Window().Check().max_drop_pc
+
+    def WindowDropPercentile(self, q):
+        """Returns the q-th percentile of the drop percentage in the rolling
+        window.
+
+        """
+        return self._Window().Percentile(q, self._resolution_pc)
+
+    @property
+    def excursions(self):
+        "Returns the excursions over each drop budget."
+        sample_interval = self._sample_interval_s * pq.s
+        return tuple(
+            DropExcursions(
+                budget_pc=budget_pc,
+                samples=int(self._samples_over[i]),
+                events=int(self._events[i]),
+                longest=int(self._longest[i]) * sample_interval,
+                total=int(self._samples_over[i]) * sample_interval,
+            )
+            for i, budget_pc in enumerate(self._budgets_pc)
+        )
@@ -0,0 +1,134 @@
+#
+# Copyright (c) 2023, Christopher Hoover
+#
+# SPDX-License-Identifier: BSD-3-Clause
+#
+
+"""Voltage drop test."""
+
+# pylint: disable=missing-function-docstring
+# pylint: disable=invalid-name
+
+import numpy as np
+import pytest
+import quantities as pq
+
+from . import voltage_drop, wire
+from .test_utils import isclose
+
+
+def _Analyzer(**kwargs):
+    # AWG 4, 40 ft there and back: about 8 mOhm.
+    return voltage_drop.VoltageDropAnalyzer(
+        4, 40.0 * pq.ft, 12.0 * pq.V, 0.01 * pq.s, **kwargs
+    )
+
+
+def testResistance():
+    expected = wire.SolidWireResistancePerUnitLength(4) * 40.0 * pq.ft
+    assert isclose(_Analyzer().resistance, expected, atol=1e-9 * pq.ohm)
+
+
+def testConstantCurrent():
+    analyzer = _Analyzer()
+    current = np.full(1000, 100.0) * pq.A
+    drop, load_voltage = analyzer.Update(current)
+    expected_drop = 100.0 * pq.A * analyzer.resistance
+    assert isclose(drop[0], expected_drop, atol=1e-9 * pq.V)
+    assert isclose(load_voltage[-1], 12.0 * pq.V - expected_drop, atol=1e-9 * pq.V)
+    assert isclose(analyzer.min_load_voltage, load_voltage[0], atol=1e-9 * pq.V)
+    assert isclose(analyzer.mean_drop, expected_drop, atol=1e-9 * pq.V)
+    assert analyzer.n_samples == 1000
+    # About 6.7 %, over the 3 % budget but not the 10 % one.
+    over_3pc, over_10pc = analyzer.excursions
+    assert (over_3pc.samples, over_3pc.events) == (1000, 1)
+    assert isclose(over_3pc.longest, 10.0 * pq.s, atol=1e-9 * pq.s)
+    assert (over_10pc.samples, over_10pc.events) == (0, 0)
+
+
+def testExcursionsAcrossChunks():
+    # Two inrush events, the first spanning chunks.
+    current = np.zeros(100)
+    current[8:14] = 200.0
+    current[50:53] = 200.0
+    whole = _Analyzer()
+    whole.Update(current * pq.A)
+    chunked = _Analyzer()
+    for start in range(0, 100, 10):
+        chunked.Update(current[start : start + 10] * pq.A)
+    for analyzer in (whole, chunked):
+        _, over_10pc = analyzer.excursions
+        assert (over_10pc.samples, over_10pc.events) == (9, 2)
+        assert isclose(over_10pc.longest, 0.06 * pq.s, atol=1e-9 * pq.s)
+        assert isclose(over_10pc.total, 0.09 * pq.s, atol=1e-9 * pq.s)
+    assert whole.excursions == chunked.excursions
+
+
+def testMeasuredSourceVoltage():
+    analyzer = _Analyzer()
+    _, load_voltage = analyzer.Update(
+        np.array([0.0, 0.0]) * pq.A, source_voltage=np.array([12.6, 13.8]) * pq.V
+    )
+    assert np.allclose(load_voltage.magnitude, [12.6, 13.8])
+
+
+def testDropPercentile():
+    rng = np.random.default_rng(1)
+    current = rng.uniform(0.0, 150.0, size=100_000)
+    analyzer = _Analyzer()
+    for chunk in np.array_split(current, 7):
+        analyzer.Update(chunk * pq.A)
+    drop_pc = 100.0 * current * float(analyzer.resistance) / 12.0
+    for q in (50.0, 95.0, 99.0):
+        assert analyzer.DropPercentile(q) == pytest.approx(
+            np.percentile(drop_pc, q), abs=0.02
+        )
+    assert analyzer.DropPercentile(100.0) == pytest.approx(analyzer.max_drop_pc)
+
+
+def testDropPercentileNoSamples():
+    with pytest.raises(ValueError):
+        _Analyzer().DropPercentile(50.0)
+
+
+def testDropPercentileWithinObservedRange():
+    analyzer = _Analyzer()
+    analyzer.Update(np.full(10, 125.0) * pq.A)
+    assert analyzer.DropPercentile(0.0) == pytest.approx(analyzer.max_drop_pc)
+    assert analyzer.DropPercentile(50.0) == pytest.approx(analyzer.max_drop_pc)
+
+
+def testNoSamples():
+    analyzer = _Analyzer()
+    for name in ("min_load_voltage", "max_drop", "max_drop_pc", "mean_drop"):
+        with pytest.raises(ValueError):
+            getattr(analyzer, name)
+
+
+def testRollingWindow():
+    # A 1 s window of 10 blocks of 10 samples.
+    analyzer = _Analyzer(window=1.0 * pq.s)
+    with pytest.raises(ValueError):
+        analyzer.WindowDropPercentile(50.0)
+    analyzer.Update(np.full(250, 200.0) * pq.A)
+    for chunk in np.array_split(np.full(95, 50.0), 4):
+        analyzer.Update(chunk * pq.A)
+    # The 200 A samples fall out of the window block by block.
+    assert analyzer.window_n_samples == 95
+    low_drop_pc = 100.0 * 50.0 * float(analyzer.resistance) / 12.0
+    assert analyzer.window_max_drop_pc == pytest.approx(low_drop_pc)
+    assert analyzer.WindowDropPercentile(99.0) == pytest.approx(low_drop_pc)
+    assert isclose(
+        analyzer.window_min_load_voltage,
+        12.0 * pq.V - 50.0 * pq.A * analyzer.resistance,
+        atol=1e-9 * pq.V,
+    )
+    assert analyzer.max_drop_pc == pytest.approx(4.0 * low_drop_pc)
+    analyzer.Update(np.full(5, 200.0) * pq.A)
+    assert analyzer.window_n_samples == 100
+    assert analyzer.window_max_drop_pc == pytest.approx(4.0 * low_drop_pc)
+
+
+def testNoWindow():
+    with pytest.raises(ValueError):
+        _Analyzer().WindowDropPercentile(50.0)
@@ -6,6 +6,9 @@
 
 """Wearables."""
 
+import dataclasses
+
+import numpy as np
 import quantities as pq
 
 from . import heat_transfer
@@ -24,3 +27,67 @@ def TouchSurfacePassiveFlux(ambient_temp):
         raise ValueError("Ambient temperature is above the touch limit.")
     # Q = h.A.dT => Q/A = h.dT
     return (heat_transfer.H_PASSIVE * dT).rescale(pq.mW / (pq.mm * pq.mm))
+
+
+@dataclasses.dataclass(frozen=True)
+class TouchSurfaceSweep:
+    """Result of TouchSurfacePassiveSweep().
+
+    Axes are (ambient_temp, power, area, solar_fraction); min_area omits
+    the area axis and max_power the power axis.
+
+    """
+
+    feasible: np.ndarray
+    min_area: pq.Quantity
+    max_power: pq.Quantity
+
+
+def TouchSurfacePassiveSweep(
+    ambient_temps, powers, areas, solar_fractions=(0.0,), max_chunk_points=1 << 20
+):
+    """Evaluates passive cooling of a touch surface over a grid of designs.
+
+    A design dissipating power through a surface of the given area, of
+    which solar_fraction absorbs heat_transfer.SOLAR_INSOLATION, is
+    feasible if the surface stays under the continuous touch temperature
+    limit.  Infeasible designs are masked rather than raising; min_area is
+    inf where no area suffices.  The grid is filled in chunks of at most
+    max_chunk_points points along the ambient temperature axis.
+
+    """
+    dT_C = np.atleast_1d(
+        (TOUCH_CONTINUOUS_TEMP_LIMIT - ambient_temps).rescale(pq.C).magnitude
+    )
+    power_W = np.atleast_1d(powers.rescale(pq.W).magnitude)
+    area_m2 = np.atleast_1d(areas.rescale(pq.m**2).magnitude)
+    solar_fraction = np.atleast_1d(np.asarray(solar_fractions, dtype=float))
+    h = heat_transfer.H_PASSIVE.rescale(pq.W / (pq.m**2 * pq.C)).magnitude
+    insolation = heat_transfer.SOLAR_INSOLATION.rescale(pq.W / pq.m**2).magnitude
+
+    n_temps, n_powers, n_areas = len(dT_C), len(power_W), len(area_m2)
+    n_solar = len(solar_fraction)
+    feasible = np.empty((n_temps, n_powers, n_areas, n_solar), dtype=bool)
+    min_area_m2 = np.empty((n_temps, n_powers, n_solar))
+    max_power_W = np.empty((n_temps, n_areas, n_solar))
+    chunk = max(1, max_chunk_points // max(1, n_powers * n_areas * n_solar))
+    for start in range(0, n_temps, chunk):
+        temps = slice(start, start + chunk)
+        # Q = h.A.dT must carry away both the power and the absorbed sunlight.
+        net_flux = h * dT_C[temps, np.newaxis] - insolation * solar_fraction
+        net_flux = net_flux[:, np.newaxis, :]
+        with np.errstate(divide="ignore", invalid="ignore"):
+            np.divide(power_W[:, np.newaxis], net_flux, out=min_area_m2[temps])
+        np.copyto(min_area_m2[temps], np.inf, where=net_flux <= 0.0)
+        np.multiply(area_m2[:, np.newaxis], net_flux, out=max_power_W[temps])
+        np.maximum(max_power_W[temps], 0.0, out=max_power_W[temps])
+        np.less_equal(
+            min_area_m2[temps][:, :, np.newaxis, :],
+            area_m2[:, np.newaxis],
+            out=feasible[temps],
+        )
+    return TouchSurfaceSweep(
+        feasible=feasible,
+        min_area=pq.Quantity(min_area_m2, pq.m**2).rescale(pq.mm**2),
+        max_power=pq.Quantity(max_power_W, pq.W).rescale(pq.mW),
+    )
@@ -8,14 +8,56 @@
 
 # pylint: disable=missing-function-docstring
 
+import numpy as np
 import quantities as pq
 
 from . import wearable
 from .test_utils import isclose
 
+_mm2 = pq.mm * pq.mm
+
 
 def test_touch_surface_passive_flux():
     ambient_temp = 25.0 * pq.C
     flux = wearable.TouchSurfacePassiveFlux(ambient_temp)
     expected_flux = 0.2 * pq.mW / (pq.mm * pq.mm)
     assert isclose(flux, expected_flux, atol=0.05 * pq.mW / (pq.mm * pq.mm))
+
+
+def test_touch_surface_passive_sweep():
+    ambient_temps = np.array([25.0, 35.0, 45.0]) * pq.C
+    powers = np.array([0.0, 100.0, 200.0]) * pq.mW
+    areas = np.array([400.0, 500.0, 1000.0]) * pq.mm**2
+    sweep = wearable.TouchSurfacePassiveSweep(
+        ambient_temps, powers, areas, solar_fractions=[0.0, 0.1, 1.0]
+    )
+    assert sweep.feasible.shape == (3, 3, 3, 3)
+    assert sweep.min_area.shape == (3, 3, 3)
+    assert sweep.max_power.shape == (3, 3, 3)
+
+    # Agrees with the flux at a single ambient temperature.
+    flux = wearable.TouchSurfacePassiveFlux(ambient_temps[0])
+    assert isclose(sweep.min_area[0, 1, 0], 100.0 * pq.mW / flux, atol=_mm2)
+    assert list(sweep.feasible[0, 1, :, 0]) == [False, True, True]
+    assert isclose(sweep.max_power[0, 2, 0], flux * areas[2], atol=1e-6 * pq.mW)
+
+    # Sunlight adds to the heat load and full sun overwhelms passive cooling.
+    assert sweep.min_area[0, 1, 1] > sweep.min_area[0, 1, 0]
+    assert np.all(np.isinf(sweep.min_area[:, 1:, 2].magnitude))
+    assert not sweep.feasible[:, 1:, :, 2].any()
+
+    # Nothing works above the touch limit.
+    assert not sweep.feasible[2, 1:].any()
+    assert np.all(sweep.max_power[2].magnitude == 0.0)
+
+
+def test_touch_surface_passive_sweep_chunks():
+    ambient_temps = np.linspace(0.0, 50.0, 51) * pq.C
+    powers = np.linspace(0.0, 500.0, 11) * pq.mW
+    areas = np.linspace(100.0, 5000.0, 13) * pq.mm**2
+    whole = wearable.TouchSurfacePassiveSweep(ambient_temps, powers, areas)
+    chunked = wearable.TouchSurfacePassiveSweep(
+        ambient_temps, powers, areas, max_chunk_points=100
+    )
+    assert np.array_equal(whole.feasible, chunked.feasible)
+    assert np.array_equal(whole.min_area.magnitude, chunked.min_area.magnitude)